@@ -0,0 +1,273 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncGoogleSheetsClient:
+    """
+    An asyncio wrapper of GoogleSheetsClient.
+
+    gspread is synchronous, so the calls run in a thread pool. All threads
+    use the session of the wrapped client, so they share one HTTP connection
+    pool which is sized to the number of threads. Independent requests, such
+    as reading the authors and the books, run at the same time and take as
+    long as the slowest of them.
+
+    Attributes:
+        client (GoogleSheetsClient, SQLiteClient or None): The wrapped
+        client. It can be None if only managers are wrapped.
+        executor (ThreadPoolExecutor): The threads which run the requests.
+    """
+
+    def __init__(self, client, max_workers=8):
+        """
+        Initializes the AsyncGoogleSheetsClient class.
+
+        Args:
+            client (GoogleSheetsClient, SQLiteClient or None): The wrapped
+            client.
+            max_workers (int): The number of concurrent requests.
+        """
+        self.client = client
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="sheets"
+        )
+        self._share_connection_pool(max_workers)
+
+    def _share_connection_pool(self, max_workers):
+        """
+        Sizes the connection pool of the shared session to the threads.
+
+        Args:
+            max_workers (int): The number of concurrent requests.
+        """
+        gspread_client = getattr(self.client, "client", None)
+        http_client = getattr(gspread_client, "http_client", None)
+        session = getattr(http_client, "session", None)
+        if session is None:
+            # Local backends do not use HTTP
+            return
+        from requests.adapters import HTTPAdapter
+
+        adapter = HTTPAdapter(
+            pool_connections=max_workers,
+            pool_maxsize=max_workers
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+    async def run(self, function, *args, **kwargs):
+        """
+        Runs a blocking function in the thread pool.
+
+        Args:
+            function (callable): The function to run.
+
+        Returns:
+            The result of the function.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            functools.partial(function, *args, **kwargs)
+        )
+
+    async def open_worksheet(self, sheet_name, worksheet):
+        """
+        Opens a specific worksheet from a Google Sheet.
+
+        Args:
+            sheet_name (str): The name of the Google Sheet.
+            worksheet (str): The name of the worksheet within the Google Sheet.
+
+        Returns:
+            gspread.models.Worksheet: The worksheet object.
+        """
+        return await self.run(
+            self.client.open_worksheet,
+            sheet_name,
+            worksheet
+        )
+
+    async def open_worksheets(self, sheet_name, worksheets):
+        """
+        Opens several worksheets at the same time.
+
+        Args:
+            sheet_name (str): The name of the Google Sheet.
+            worksheets (list): The names of the worksheets.
+
+        Returns:
+            list: The worksheet objects in the same order.
+        """
+        return await asyncio.gather(*(
+            self.open_worksheet(sheet_name, worksheet)
+            for worksheet in worksheets
+        ))
+
+    def wrap(self, manager):
+        """
+        Wraps a manager to call it from asyncio code.
+
+        Args:
+            manager (GoogleSheet): The manager of a worksheet.
+
+        Returns:
+            AsyncGoogleSheet: The wrapped manager.
+        """
+        return AsyncGoogleSheet(manager, self)
+
+    def close(self):
+        """Stops the threads after the running requests are finished."""
+        self.executor.shutdown(wait=True)
+
+
+class AsyncGoogleSheet:
+    """
+    An asyncio wrapper of GoogleSheet.
+
+    The manager guards its cache with its RLock _lock, so its methods can
+    be called from any thread. The background revalidation downloads
+    the worksheet without the lock and takes it only to replace the cache,
+    and the timed flush of queued writes takes it too. The calls
+    to one worksheet are still run one at a time, in the order they were
+    made, so they do not take several threads of the pool while they wait
+    for that lock. Calls to different worksheets run at the same time.
+
+    Attributes:
+        manager (GoogleSheet): The wrapped manager.
+        client (AsyncGoogleSheetsClient): The client which runs the calls.
+        lock (asyncio.Lock): The lock which orders the calls to
+        the worksheet.
+    """
+
+    def __init__(self, manager, client):
+        """
+        Initializes the AsyncGoogleSheet class.
+
+        Args:
+            manager (GoogleSheet): The wrapped manager.
+            client (AsyncGoogleSheetsClient): The client which runs the calls.
+        """
+        self.manager = manager
+        self.client = client
+        self.lock = asyncio.Lock()
+
+    async def _call(self, function, *args):
+        """
+        Runs a method of the manager in the thread pool.
+
+        Args:
+            function (callable): The bound method of the manager.
+
+        Returns:
+            The result of the method.
+        """
+        async with self.lock:
+            return await self.client.run(function, *args)
+
+    async def get_all_records(self):
+        """
+        Retrieves all records from the worksheet.
+
+        Returns:
+            list: A list of dictionaries containing all records.
+        """
+        return await self._call(self.manager.get_all_records)
+
+    async def refresh(self):
+        """
+        Downloads all records from the worksheet and replaces the cache.
+
+        Returns:
+            list: A list of dictionaries containing all records.
+        """
+        return await self._call(self.manager.refresh)
+
+    async def append_row(self, values):
+        """
+        Appends a new row to the worksheet.
+
+        Args:
+            values (list): A list of values to append as a new row.
+
+        Returns:
+            bool: True if the row was appended successfully, False otherwise.
+        """
+        return await self._call(self.manager.append_row, values)
+
+    async def update_row(self, row, values_list):
+        """
+        Updates a row in the worksheet.
+
+        Args:
+            row (int): The row number of the cell.
+            values_list (list): The list of values to set in the cells.
+
+        Returns:
+            bool: True if the row was updated successfully, False otherwise.
+        """
+        return await self._call(self.manager.update_row, row, values_list)
+
+    async def flush(self):
+        """
+        Sends all queued writes to the worksheet.
+
+        Returns:
+            list: A list of the flushed WriteResult objects.
+        """
+        return await self._call(self.manager.flush)
+
+
+async def gather_records(client, managers):
+    """
+    Loads the records of several managers at the same time.
+
+    Args:
+        client (AsyncGoogleSheetsClient): The client which runs the calls.
+        managers (list): The managers of the worksheets.
+
+    Returns:
+        list: The lists of records in the same order.
+    """
+    return await asyncio.gather(*(
+        client.wrap(manager).get_all_records() for manager in managers
+    ))
+
+
+async def flush_all(client, managers):
+    """
+    Sends the queued writes of several managers at the same time.
+
+    Args:
+        client (AsyncGoogleSheetsClient): The client which runs the calls.
+        managers (list): The managers of the worksheets.
+
+    Returns:
+        list: The lists of WriteResult objects in the same order.
+    """
+    return await asyncio.gather(*(
+        client.wrap(manager).flush() for manager in managers
+    ))
+
+
+def load_records(*managers):
+    """
+    Loads the records of the managers whose cache is not valid at the same
+    time. It is called from synchronous code such as the menu.
+
+    Args:
+        managers (GoogleSheet): The managers of the worksheets.
+    """
+    stale = [manager for manager in managers if not manager.is_cache_valid()]
+    if len(stale) < 2:
+        # One request does not need the thread pool
+        for manager in stale:
+            manager.get_all_records()
+        return
+    client = AsyncGoogleSheetsClient(None, max_workers=len(stale))
+    try:
+        asyncio.run(gather_records(client, stale))
+    finally:
+        client.close()
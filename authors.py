@@ -13,6 +13,9 @@ class Author:
         birth_year (int): The author's birth year.
     """
 
+    # Authors are created for every listed row, so they have no __dict__
+    __slots__ = ("id", "full_name", "birth_year")
+
     def __init__(self, id, full_name, birth_year):
         """
         Initializes the Author class with the given details.
@@ -52,12 +55,16 @@ class Authors(UniqueIDMixin, GoogleSheet):
     Inherits from GoogleSheet.
     """
 
-    def __init__(self, sheet):
+    def __init__(self, sheet, cache_ttl=300, snapshot_store=None):
         """
         Initializes the Authors class.
 
         Args:
             sheet (gspread.models.Worksheet): The worksheet object.
+            cache_ttl (float or None): The number of seconds the cached
+            records stay valid.
+            snapshot_store (SnapshotStore or None): The local store of
+            the records.
         """
         # Use the dictionary to have the feature to quickly change a column's
         # position
@@ -67,7 +74,24 @@ class Authors(UniqueIDMixin, GoogleSheet):
             "birth_year": "BIRTH YEAR",
         }
 
-        super().__init__(sheet)
+        super().__init__(
+            sheet,
+            cache_ttl,
+            indexed_attributes=[self.attributes_name["id"]],
+            substring_indexed_attributes=[
+                self.attributes_name["full_name"]
+            ],
+            fuzzy_indexed_attributes=[
+                self.attributes_name["full_name"]
+            ],
+            headers=list(self.attributes_name.values()),
+            snapshot_store=snapshot_store,
+            snapshot_name="authors",
+            unique_keys=[(
+                self.attributes_name["full_name"],
+                self.attributes_name["birth_year"],
+            )],
+        )
 
     def get_headers_for_table(self):
         """
@@ -83,6 +107,20 @@ class Authors(UniqueIDMixin, GoogleSheet):
             self.attributes_name["birth_year"]
         ]
 
+    def get_author_attributes(self):
+        """
+        Returns the headers of the columns in the order of the arguments
+        of Author.
+
+        Returns:
+            list: A list of headers.
+        """
+        return [
+            self.attributes_name["id"],
+            self.attributes_name["full_name"],
+            self.attributes_name["birth_year"],
+        ]
+
     def get_all_authors(self):
         """
         Retrieves all authors from the worksheet.
@@ -90,14 +128,9 @@ class Authors(UniqueIDMixin, GoogleSheet):
         Returns:
             list: A list of Author objects.
         """
-        records = self.get_all_records()
         return [
-            Author(
-                record[self.attributes_name["id"]],
-                record[self.attributes_name["full_name"]],
-                record[self.attributes_name["birth_year"]],
-            )
-            for record in records
+            Author(*values)
+            for values in self.get_tuples(self.get_author_attributes())
         ]
 
     def get_all_authors_dictionary(self):
@@ -107,13 +140,11 @@ class Authors(UniqueIDMixin, GoogleSheet):
         Returns:
             dictionary: A dictionary of ID and full name.
         """
-        records = self.get_all_records()
-        return {
-            record.get(self.attributes_name["id"]): record.get(
-                self.attributes_name["full_name"]
-            )
-            for record in records
-        }
+        # Only the two columns are read, not the whole records
+        return dict(zip(*self.read_columns([
+            self.attributes_name["id"],
+            self.attributes_name["full_name"],
+        ])))
 
     def find_author(self, value):
         """
@@ -177,4 +208,9 @@ class Authors(UniqueIDMixin, GoogleSheet):
         Returns:
             bool: True if the row was updated successfully, False otherwise.
         """
-        return self.update_row(row, author.to_list())
+        # Only the changed cells are written, if the row is still the author
+        return self.update_fields(
+            row,
+            dict(zip(self.get_author_attributes(), author.to_list())),
+            {self.attributes_name["id"]: author.id}
+        )
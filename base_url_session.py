@@ -0,0 +1,45 @@
+import requests
+
+
+class BaseURLSession(requests.Session):
+    """
+    A requests session which sends the Google API requests to another host.
+
+    It is used to point gspread at a local stand-in of the Sheets API.
+
+    Attributes:
+        base_url (str): The URL which replaces the Google API hosts.
+    """
+
+    GOOGLE_API_HOSTS = (
+        "https://sheets.googleapis.com",
+        "https://www.googleapis.com",
+    )
+
+    def __init__(self, base_url):
+        """
+        Initializes the BaseURLSession class.
+
+        Args:
+            base_url (str): The URL of the stand-in server, e.g.
+            "http://127.0.0.1:8765".
+        """
+        super().__init__()
+        self.base_url = base_url.rstrip("/")
+
+    def request(self, method, url, *args, **kwargs):
+        """
+        Sends the request to the stand-in server.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The URL of the Google API.
+
+        Returns:
+            requests.Response: The response.
+        """
+        for host in self.GOOGLE_API_HOSTS:
+            if url.startswith(host):
+                url = self.base_url + url[len(host):]
+                break
+        return super().request(method, url, *args, **kwargs)
@@ -0,0 +1,403 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timezone
+from authors import Authors
+from books import Books
+
+
+WORDS = [
+    "war", "peace", "night", "river", "garden", "silent", "house", "winter",
+    "crime", "time", "dream", "city", "stone", "ocean", "story", "shadow",
+    "light", "road", "brother", "daughter", "king", "island", "fire", "song",
+]
+FIRST_NAMES = [
+    "Leo", "Jane", "Anton", "Mary", "Fyodor", "Charlotte", "Mark", "Virginia",
+    "Ivan", "Emily", "Franz", "George", "Agatha", "Ernest", "Anna", "Oscar",
+]
+LAST_NAMES = [
+    "Tolstoy", "Austen", "Chekhov", "Shelley", "Dostoevsky", "Bronte",
+    "Twain", "Woolf", "Turgenev", "Dickinson", "Kafka", "Orwell", "Christie",
+    "Hemingway", "Akhmatova", "Wilde",
+]
+
+
+class MemoryWorksheet:
+    """
+    An in-memory worksheet with the part of the gspread API the managers use.
+
+    It replaces the network so that only the code of the application is
+    measured.
+
+    Attributes:
+        title (str): The name of the worksheet.
+        rows (list): The rows of the worksheet including the header row.
+    """
+
+    def __init__(self, title, headers, rows):
+        """
+        Initializes the MemoryWorksheet class.
+
+        Args:
+            title (str): The name of the worksheet.
+            headers (list): The header row.
+            rows (list): The data rows.
+        """
+        self.title = title
+        self.rows = [list(headers)] + [list(row) for row in rows]
+
+    def get_all_records(self):
+        """
+        Returns the records like gspread does.
+
+        Returns:
+            list: A list of dictionaries where the key is the header.
+        """
+        headers = self.rows[0]
+        return [dict(zip(headers, row)) for row in self.rows[1:]]
+
+    def get_all_values(self):
+        """
+        Returns all values as strings.
+
+        Returns:
+            list: A list of rows including the header row.
+        """
+        return [[str(value) for value in row] for row in self.rows]
+
+    def row_values(self, row):
+        """
+        Returns the values of a row.
+
+        Args:
+            row (int): The row number.
+
+        Returns:
+            list: A list of values.
+        """
+        return list(self.rows[row - 1]) if row <= len(self.rows) else []
+
+    def batch_get(self, ranges, major_dimension=None):
+        """
+        Returns the values of several A1 ranges as strings.
+
+        Args:
+            ranges (list): The A1 ranges, e.g. ["B2:B", "A5:D5"].
+            major_dimension (str or None): "COLUMNS" returns every range
+            as a list of columns, otherwise it is a list of rows.
+
+        Returns:
+            list: The values of every range.
+        """
+        from gspread.utils import a1_range_to_grid_range
+
+        value_ranges = []
+        for range_name in ranges:
+            grid = a1_range_to_grid_range(range_name)
+            values = [
+                [
+                    str(value)
+                    for value in row[
+                        grid.get("startColumnIndex", 0):
+                        grid.get("endColumnIndex")
+                    ]
+                ]
+                for row in self.rows[
+                    grid.get("startRowIndex", 0):grid.get("endRowIndex")
+                ]
+            ]
+            if major_dimension == "COLUMNS":
+                values = [list(column) for column in zip(*values)]
+            value_ranges.append(values)
+        return value_ranges
+
+    def append_rows(self, values):
+        """
+        Appends rows.
+
+        Args:
+            values (list): A list of rows.
+
+        Returns:
+            dict: The response with the updated range.
+        """
+        first_row = len(self.rows) + 1
+        self.rows.extend(list(row) for row in values)
+        return {
+            "updates": {
+                "updatedRange": f"{self.title}!A{first_row}:Z{len(self.rows)}"
+            }
+        }
+
+    def batch_update(self, data):
+        """
+        Updates the cells of several ranges.
+
+        Args:
+            data (list): A list of dictionaries with "range" and "values".
+        """
+        from gspread.utils import a1_range_to_grid_range
+
+        for item in data:
+            grid = a1_range_to_grid_range(item["range"])
+            first_row = grid.get("startRowIndex", 0)
+            first_column = grid.get("startColumnIndex", 0)
+            for offset, values in enumerate(item["values"]):
+                row = self.rows[first_row + offset]
+                end = first_column + len(values)
+                row.extend([""] * (end - len(row)))
+                row[first_column:end] = values
+
+
+def generate_catalog(book_count, seed=42):
+    """
+    Generates synthetic authors and books.
+
+    Every author has about ten books.
+
+    Args:
+        book_count (int): The number of books.
+        seed (int): The seed of the random generator.
+
+    Returns:
+        tuple: (authors rows, books rows).
+    """
+    generator = random.Random(seed)
+    author_count = max(1, book_count // 10)
+    authors = [
+        [
+            str(uuid.UUID(int=generator.getrandbits(128))),
+            f"{generator.choice(FIRST_NAMES)} {generator.choice(LAST_NAMES)}",
+            generator.randint(1700, 2000),
+        ]
+        for _ in range(author_count)
+    ]
+    books = [
+        [
+            str(uuid.UUID(int=generator.getrandbits(128))),
+            " ".join(generator.choices(WORDS, k=generator.randint(2, 5)))
+            .capitalize(),
+            generator.choice(authors)[0],
+            generator.randint(1, 200),
+        ]
+        for _ in range(book_count)
+    ]
+    return authors, books
+
+
+def measure(function, repeat):
+    """
+    Measures the latency and the peak memory of a function.
+
+    The memory is traced in a separate call, so tracing does not slow down
+    the measured latency.
+
+    Args:
+        function (callable): The function without arguments.
+        repeat (int): The number of timed calls.
+
+    Returns:
+        dict: The median and minimal latency in milliseconds and the peak
+        memory in kilobytes.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def run_size(book_count, repeat):
+    """
+    Runs every benchmark for one catalog size.
+
+    "cold" benchmarks drop the cache first, so they include decoding of
+    the worksheet. "warm" benchmarks use the loaded cache.
+
+    Args:
+        book_count (int): The number of books.
+        repeat (int): The number of timed calls.
+
+    Returns:
+        dict: A dictionary where the key is the name of the benchmark.
+    """
+    from menu import Menu
+
+    author_rows, book_rows = generate_catalog(book_count)
+    authors_sheet = MemoryWorksheet(
+        "authors",
+        ["ID", "FULL NAME", "BIRTH YEAR"],
+        author_rows
+    )
+    books_sheet = MemoryWorksheet(
+        "books",
+        ["ID", "TITLE", "AUTHOR (ID)", "SHELF"],
+        book_rows
+    )
+    authors = Authors(authors_sheet, cache_ttl=None)
+    books = Books(books_sheet, cache_ttl=None)
+    menu = Menu(authors, books)
+    author_id = author_rows[len(author_rows) // 2][0]
+    title = book_rows[len(book_rows) // 2][1]
+    # The title with a typo in its last word
+    misspelled_title = title[:-1] + "q"
+    # Half of the candidates are already in the catalog
+    candidates = [
+        {"TITLE": row[1] if i % 2 else f"New title {i}", "AUTHOR (ID)": row[2]}
+        for i, row in enumerate(book_rows[:1000])
+    ]
+
+    def cold(manager, function):
+        def run():
+            manager.invalidate()
+            function()
+        return run
+
+    def print_books():
+        # The output is not a terminal, so the pager prints every row
+        with contextlib.redirect_stdout(io.StringIO()):
+            menu.get_all_books()
+
+    benchmarks = {
+        "find_cells_by_title_cold": cold(
+            books,
+            lambda: books.find_cells_contain_value({"TITLE": "river"}, {})
+        ),
+        "find_cells_by_title_warm": lambda: books.find_cells_contain_value(
+            {"TITLE": "river"}, {}
+        ),
+        "find_cells_by_author_id_warm": (
+            lambda: books.find_cells_contain_value(
+                {}, {"AUTHOR (ID)": author_id}
+            )
+        ),
+        "find_similar_by_title_warm": lambda: books.find_similar_cells(
+            {"TITLE": misspelled_title}, {}
+        ),
+        "check_duplicate_data_cold": cold(
+            books,
+            lambda: books.check_duplicate_data(
+                {"TITLE": title, "AUTHOR (ID)": author_id}
+            )
+        ),
+        "check_duplicate_data_warm": lambda: books.check_duplicate_data(
+            {"TITLE": title, "AUTHOR (ID)": author_id}
+        ),
+        "find_duplicates_1000_warm": lambda: books.find_duplicates(
+            candidates
+        ),
+        "get_all_authors_dictionary_cold": cold(
+            authors,
+            authors.get_all_authors_dictionary
+        ),
+        "get_books_by_author_cold": cold(
+            books,
+            lambda: books.get_books_by_author(author_id)
+        ),
+        "print_books_warm": print_books,
+        "books_with_authors_warm": menu.catalog.get_table_rows,
+    }
+    return {
+        name: measure(function, repeat)
+        for name, function in benchmarks.items()
+    }
+
+
+def get_commit():
+    """
+    Returns the current git commit.
+
+    Returns:
+        str or None: The commit hash or None outside of a repository.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline):
+    """
+    Prints the ratio of every median latency to the baseline.
+
+    Args:
+        results (dict): The current results.
+        baseline (dict): The results of an earlier run.
+    """
+    for size, benchmarks in results["sizes"].items():
+        for name, result in benchmarks.items():
+            old = baseline["sizes"].get(size, {}).get(name)
+            if not old or not old["median_ms"]:
+                continue
+            ratio = result["median_ms"] / old["median_ms"]
+            print(
+                f"{size:>8} {name:<34} {old['median_ms']:>10.3f} ms -> "
+                f"{result['median_ms']:>10.3f} ms  x{ratio:.2f}"
+            )
+
+
+def main():
+    """Runs the benchmarks and stores the results as JSON."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark search, duplicate check and table rendering."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1000, 100000, 1000000],
+        help="The numbers of books in the synthetic catalogs.",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument(
+        "--compare",
+        help="JSON file of an earlier run to compare with.",
+    )
+    args = parser.parse_args()
+
+    results = {
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "created": datetime.now(timezone.utc).isoformat(),
+        "sizes": {},
+    }
+    for size in args.sizes:
+        print(f"Running benchmarks for {size} books...")
+        results["sizes"][str(size)] = run_size(size, args.repeat)
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+    print(f"Results saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            compare(results, json.load(file))
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,9 @@ class Book:
         stored.
     """
 
+    # Books are created for every listed row, so they have no __dict__
+    __slots__ = ("id", "title", "author_id", "shelf_number")
+
     def __init__(self, id, title, author_id, shelf_number):
         """
         Initializes the Book class with the given details.
@@ -63,12 +66,16 @@ class Books(UniqueIDMixin, GoogleSheet):
     Inherits from GoogleSheet.
     """
 
-    def __init__(self, sheet):
+    def __init__(self, sheet, cache_ttl=300, snapshot_store=None):
         """
         Initializes the Books class.
 
         Args:
             sheet (gspread.models.Worksheet): The worksheet object.
+            cache_ttl (float or None): The number of seconds the cached
+            records stay valid.
+            snapshot_store (SnapshotStore or None): The local store of
+            the records.
         """
         # Use the dictionary to have the feature to quickly change a column's
         # position
@@ -79,7 +86,27 @@ class Books(UniqueIDMixin, GoogleSheet):
             "shelf_number": "SHELF",
         }
 
-        super().__init__(sheet)
+        super().__init__(
+            sheet,
+            cache_ttl,
+            indexed_attributes=[
+                self.attributes_name["id"],
+                self.attributes_name["author_id"],
+            ],
+            substring_indexed_attributes=[
+                self.attributes_name["title"]
+            ],
+            fuzzy_indexed_attributes=[
+                self.attributes_name["title"]
+            ],
+            headers=list(self.attributes_name.values()),
+            snapshot_store=snapshot_store,
+            snapshot_name="books",
+            unique_keys=[(
+                self.attributes_name["title"],
+                self.attributes_name["author_id"],
+            )],
+        )
 
     def get_headers_for_table(self):
         """
@@ -96,6 +123,21 @@ class Books(UniqueIDMixin, GoogleSheet):
             self.attributes_name["shelf_number"]
         ]
 
+    def get_book_attributes(self):
+        """
+        Returns the headers of the columns in the order of the arguments
+        of Book.
+
+        Returns:
+            list: A list of headers.
+        """
+        return [
+            self.attributes_name["id"],
+            self.attributes_name["title"],
+            self.attributes_name["author_id"],
+            self.attributes_name["shelf_number"],
+        ]
+
     def get_all_books(self):
         """
         Retrieves all books from the worksheet.
@@ -103,15 +145,9 @@ class Books(UniqueIDMixin, GoogleSheet):
         Returns:
             list: A list of Book objects.
         """
-        records = self.get_all_records()
         return [
-            Book(
-                record[self.attributes_name["id"]],
-                record[self.attributes_name["title"]],
-                record[self.attributes_name["author_id"]],
-                record[self.attributes_name["shelf_number"]],
-            )
-            for record in records
+            Book(*values)
+            for values in self.get_tuples(self.get_book_attributes())
         ]
 
     def get_all_books_with_selection(self, attributes_any, attributes_all):
@@ -130,17 +166,35 @@ class Books(UniqueIDMixin, GoogleSheet):
             List of Book objects: The list of Book objects.
         """
         cells = self.find_cells_contain_value(attributes_any, attributes_all)
-        books = []
-        for cell in cells:
-            books.append(
-                Book(
-                    cell[1][self.attributes_name["id"]],
-                    cell[1][self.attributes_name["title"]],
-                    cell[1][self.attributes_name["author_id"]],
-                    cell[1][self.attributes_name["shelf_number"]],
-                )
+        return [
+            Book(*values)
+            for values in self.get_tuples(
+                self.get_book_attributes(),
+                [cell[0] for cell in cells]
             )
-        return books
+        ]
+
+    def get_books_by_author(self, author_id):
+        """
+        Gets the books of an author.
+
+        Without cached records only the author ID column and the rows of
+        the found books are downloaded.
+
+        Args:
+            author_id (str): The author's ID.
+
+        Returns:
+            List of Book objects: The list of Book objects.
+        """
+        rows = self.get_rows_by_value(
+            self.attributes_name["author_id"],
+            author_id
+        )
+        return [
+            Book(*values)
+            for values in self.get_tuples(self.get_book_attributes(), rows)
+        ]
 
     def edit_book(self, row, book):
         """
@@ -153,7 +207,12 @@ class Books(UniqueIDMixin, GoogleSheet):
         Returns:
             bool: True if the row was updated successfully, False otherwise.
         """
-        return self.update_row(row, book.to_list())
+        # Only the changed cells are written, if the row is still the book
+        return self.update_fields(
+            row,
+            dict(zip(self.get_book_attributes(), book.to_list())),
+            {self.attributes_name["id"]: book.id}
+        )
 
     def find_book(self, value, author_id, author_full_name):
         """
@@ -0,0 +1,293 @@
+import argparse
+import csv
+import json
+import os
+from colorama import Fore
+from authors import Author
+from books import Book
+
+
+class BulkImporter:
+    """
+    Imports authors and books from CSV or JSONL files in one pass.
+
+    The rows of the file are checked for duplicates a chunk at a time
+    with one find_duplicates call, which answers from the uniqueness key
+    indexes of the managers. New rows are written in chunks with
+    append_rows, so the indexes also contain the rows already imported
+    from the file.
+
+    Attributes:
+        authors_manager (Authors): An instance of the Authors class.
+        books_manager (Books): An instance of the Books class.
+        chunk_size (int): The number of rows sent in one write.
+    """
+
+    def __init__(self, authors_manager, books_manager, chunk_size=500):
+        """
+        Initializes the BulkImporter class.
+
+        Args:
+            authors_manager (Authors): An instance of the Authors class.
+            books_manager (Books): An instance of the Books class.
+            chunk_size (int): The number of rows sent in one write.
+        """
+        self.authors_manager = authors_manager
+        self.books_manager = books_manager
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def read_records(file_path):
+        """
+        Streams the records of a CSV or JSONL file.
+
+        The format is chosen by the file extension. CSV files need a header
+        row.
+
+        Args:
+            file_path (str): Path to the file.
+
+        Yields:
+            dict: The next record of the file.
+        """
+        extension = os.path.splitext(file_path)[1].lower()
+        with open(file_path, newline="", encoding="utf-8") as file:
+            if extension in (".jsonl", ".ndjson"):
+                for line in file:
+                    line = line.strip()
+                    if line:
+                        yield json.loads(line)
+            else:
+                yield from csv.DictReader(file)
+
+    @staticmethod
+    def get_field(record, manager, key, aliases=()):
+        """
+        Reads a field of an imported record.
+
+        The field can be named by the attribute key (e.g. "author_id"), by
+        the header of the worksheet (e.g. "AUTHOR (ID)") or by one of
+        the aliases. The names are compared without regard to case.
+
+        Args:
+            record (dict): The imported record.
+            manager (GoogleSheet): The manager which names the columns.
+            key (str): The attribute key.
+            aliases (iterable): Other names of the field, e.g. "author".
+
+        Returns:
+            str: The first value which is not empty, stripped, or an empty
+            string.
+        """
+        fields = {
+            str(name).strip().lower(): value
+            for name, value in record.items()
+        }
+        for name in (key, manager.attributes_name[key], *aliases):
+            value = fields.get(name.lower())
+            if value is not None and str(value).strip():
+                return str(value).strip()
+        return ""
+
+    @staticmethod
+    def parse_positive_int(value):
+        """
+        Converts the value to a positive whole number.
+
+        Args:
+            value (str): The value to convert.
+
+        Returns:
+            int or None: The number or None if the value is not valid.
+        """
+        try:
+            number = int(value)
+        except ValueError:
+            return None
+        return number if number > 0 else None
+
+    def _write_chunk(self, manager, results, summary):
+        """
+        Flushes the queued rows and counts the results.
+
+        Args:
+            manager (GoogleSheet): The manager which queued the rows.
+            results (list): The WriteResult objects of the chunk.
+            summary (dict): The counters of the import.
+        """
+        manager.flush()
+        for result in results:
+            if result.success:
+                summary["added"] += 1
+            else:
+                summary["failed"] += 1
+        results.clear()
+
+    def _import_chunk(self, manager, candidates, summary):
+        """
+        Writes the candidates which are not duplicates.
+
+        Args:
+            manager (GoogleSheet): The manager of the worksheet.
+            candidates (list): Tuples (attributes, model, values) where
+            attributes is the uniqueness key of the row and the new item is
+            model(ID, *values).
+            summary (dict): The counters of the import.
+        """
+        duplicates = manager.find_duplicates([
+            attributes for attributes, _, _ in candidates
+        ])
+        results = []
+        for (attributes, model, values), duplicate in zip(
+            candidates,
+            duplicates
+        ):
+            if duplicate is not None:
+                summary["duplicates"] += 1
+                continue
+            item = model(manager.generate_unique_id(), *values)
+            results.append(manager.queue_append_row(item.to_list()))
+        self._write_chunk(manager, results, summary)
+        candidates.clear()
+
+    def import_authors(self, file_path):
+        """
+        Imports authors from the file.
+
+        Every record needs "full_name" and "birth_year".
+
+        Args:
+            file_path (str): Path to the CSV or JSONL file.
+
+        Returns:
+            dict: The numbers of added, duplicate, invalid and failed rows.
+        """
+        manager = self.authors_manager
+        attributes_name = manager.attributes_name
+        summary = {"added": 0, "duplicates": 0, "invalid": 0, "failed": 0}
+        candidates = []
+        for record in self.read_records(file_path):
+            full_name = self.get_field(record, manager, "full_name")
+            birth_year = self.parse_positive_int(
+                self.get_field(record, manager, "birth_year")
+            )
+            if not full_name or birth_year is None:
+                summary["invalid"] += 1
+                continue
+            candidates.append((
+                {
+                    attributes_name["full_name"]: full_name,
+                    attributes_name["birth_year"]: birth_year,
+                },
+                Author,
+                (full_name, birth_year),
+            ))
+            if len(candidates) >= self.chunk_size:
+                self._import_chunk(manager, candidates, summary)
+        self._import_chunk(manager, candidates, summary)
+        return summary
+
+    def _get_author_resolver(self):
+        """
+        Builds the lookup of author IDs by ID or full name.
+
+        Returns:
+            tuple: (set, dict) the set of author IDs and a dictionary where
+            the key is the lowercase full name and the value is the list of
+            IDs of authors with this name.
+        """
+        attributes_name = self.authors_manager.attributes_name
+        ids = set()
+        ids_by_name = {}
+        for record in self.authors_manager.get_all_records():
+            author_id = str(record.get(attributes_name["id"]))
+            full_name = str(record.get(attributes_name["full_name"]))
+            ids.add(author_id)
+            ids_by_name.setdefault(full_name.strip().lower(), []).append(
+                author_id
+            )
+        return ids, ids_by_name
+
+    def import_books(self, file_path):
+        """
+        Imports books from the file.
+
+        Every record needs "title", "shelf_number" and the author as
+        "author_id", "AUTHOR (ID)" or "author" which is the ID or the full
+        name. The columns may also be named by the headers of the worksheet.
+        Names shared by several authors cannot be resolved and are counted
+        as invalid.
+
+        Args:
+            file_path (str): Path to the CSV or JSONL file.
+
+        Returns:
+            dict: The numbers of added, duplicate, invalid and failed rows.
+        """
+        manager = self.books_manager
+        attributes_name = manager.attributes_name
+        summary = {"added": 0, "duplicates": 0, "invalid": 0, "failed": 0}
+        author_ids, ids_by_name = self._get_author_resolver()
+        candidates = []
+        for record in self.read_records(file_path):
+            title = self.get_field(record, manager, "title")
+            shelf_number = self.parse_positive_int(
+                self.get_field(record, manager, "shelf_number")
+            )
+            author = self.get_field(
+                record, manager, "author_id", ("author",)
+            )
+            if author not in author_ids:
+                # Resolve the full name to the ID
+                matches = ids_by_name.get(author.lower(), [])
+                author = matches[0] if len(matches) == 1 else None
+            if not title or shelf_number is None or author is None:
+                summary["invalid"] += 1
+                continue
+            candidates.append((
+                {
+                    attributes_name["title"]: title,
+                    attributes_name["author_id"]: author,
+                },
+                Book,
+                (title, author, shelf_number),
+            ))
+            if len(candidates) >= self.chunk_size:
+                self._import_chunk(manager, candidates, summary)
+        self._import_chunk(manager, candidates, summary)
+        return summary
+
+
+def main():
+    """Imports the file given on the command line."""
+    from run import open_managers
+
+    parser = argparse.ArgumentParser(
+        description="Import authors or books from a CSV or JSONL file."
+    )
+    parser.add_argument("kind", choices=["authors", "books"])
+    parser.add_argument("file", help="Path to the CSV or JSONL file.")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=500,
+        help="The number of rows sent in one write.",
+    )
+    args = parser.parse_args()
+
+    authors_manager, books_manager = open_managers()
+    importer = BulkImporter(authors_manager, books_manager, args.chunk_size)
+    if args.kind == "authors":
+        summary = importer.import_authors(args.file)
+    else:
+        summary = importer.import_books(args.file)
+
+    print(
+        Fore.GREEN +
+        f"Added: {summary['added']}, duplicates: {summary['duplicates']}, "
+        f"invalid: {summary['invalid']}, failed: {summary['failed']}."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,695 @@
+import argparse
+import json
+import sys
+from authors import Author
+from books import Book
+from bulk_import import BulkImporter
+from catalog_view import BooksWithAuthorsView
+from indexes import HashIndex
+
+
+class CatalogCommands:
+    """
+    Runs the operations of the catalog without the menu.
+
+    Every operation is a dictionary with a "command" and its fields. It
+    gets one response dictionary, which is written as a JSON line. One
+    instance serves a whole batch, so all operations share one client and
+    the warm caches of the managers.
+
+    Consecutive "add" or "edit" operations of the same kind are checked
+    first and then sent as one write, like the chunks of the bulk import.
+    The responses keep the order of the operations.
+
+    Attributes:
+        authors_manager (Authors): An instance of the Authors class.
+        books_manager (Books): An instance of the Books class.
+        catalog (BooksWithAuthorsView): The books with the full names of
+        their authors.
+        chunk_size (int): The largest number of operations sent in one
+        write.
+        limit (int): The default number of items returned by "find".
+    """
+
+    COMMANDS = ("list", "find", "add", "edit", "books-by-author")
+    # Consecutive operations of these commands are written together
+    WRITE_COMMANDS = ("add", "edit")
+
+    def __init__(
+        self,
+        authors_manager,
+        books_manager,
+        chunk_size=500,
+        limit=100
+    ):
+        """
+        Initializes the CatalogCommands class.
+
+        Args:
+            authors_manager (Authors): An instance of the Authors class.
+            books_manager (Books): An instance of the Books class.
+            chunk_size (int): The largest number of operations sent in one
+            write.
+            limit (int): The default number of items returned by "find".
+        """
+        self.authors_manager = authors_manager
+        self.books_manager = books_manager
+        self.catalog = BooksWithAuthorsView(books_manager, authors_manager)
+        self.chunk_size = chunk_size
+        self.limit = limit
+
+    @staticmethod
+    def read_requests(file):
+        """
+        Streams the operations of a JSON lines file.
+
+        Args:
+            file (file object): The opened file, e.g. the standard input.
+
+        Yields:
+            dict or str: The next operation, or the line itself if it is
+            not valid JSON.
+        """
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield line
+
+    @staticmethod
+    def write_responses(responses, file):
+        """
+        Writes the responses as JSON lines.
+
+        Args:
+            responses (iterable): The response dictionaries.
+            file (file object): The opened output file.
+
+        Returns:
+            int: The number of failed operations.
+        """
+        failed = 0
+        for response in responses:
+            file.write(
+                json.dumps(response, ensure_ascii=False, default=str) + "\n"
+            )
+            file.flush()
+            if not response["ok"]:
+                failed += 1
+        return failed
+
+    def get_manager(self, kind):
+        """
+        Returns the manager of the authors or the books.
+
+        Args:
+            kind (str): "authors" or "books".
+
+        Returns:
+            GoogleSheet: The manager.
+
+        Raises:
+            ValueError: If the kind is not known.
+        """
+        if kind == "authors":
+            return self.authors_manager
+        if kind == "books":
+            return self.books_manager
+        raise ValueError("The kind has to be 'authors' or 'books'.")
+
+    def to_dicts(self, manager, rows=None):
+        """
+        Reads items as dictionaries keyed by the attribute keys.
+
+        Books also get "author_full_name".
+
+        Args:
+            manager (GoogleSheet): The manager of the worksheet.
+            rows (list or None): The row numbers. None reads all items.
+
+        Returns:
+            list: The dictionaries in the order of the rows.
+        """
+        if rows is not None and not rows:
+            return []
+        keys = list(manager.attributes_name)
+        items = [
+            dict(zip(keys, values))
+            for values in manager.get_tuples(
+                list(manager.attributes_name.values()),
+                rows
+            )
+        ]
+        if manager is self.books_manager:
+            author_names = self.catalog.get_author_names()
+            for item in items:
+                item["author_full_name"] = author_names.get(
+                    item["author_id"],
+                    BooksWithAuthorsView.INVALID_AUTHOR
+                )
+        return items
+
+    def find_author(self, value):
+        """
+        Finds one author by the ID or the whole full name.
+
+        Args:
+            value (str): The ID or the full name, the case is ignored.
+
+        Returns:
+            dict: The author's attributes.
+
+        Raises:
+            ValueError: If no author or several authors have the name.
+        """
+        names = self.authors_manager.attributes_name
+        value = str(value).strip()
+        if not value:
+            raise ValueError("The author is required.")
+        rows = self.authors_manager.get_rows_by_value(names["id"], value)
+        if not rows:
+            key = HashIndex.normalize(value)
+            rows = [
+                row
+                for row, record in self.authors_manager
+                .find_cells_contain_value({names["full_name"]: value}, {})
+                if HashIndex.normalize(record[names["full_name"]]) == key
+            ]
+        if not rows:
+            raise ValueError(f"The author '{value}' is not found.")
+        if len(rows) > 1:
+            raise ValueError(
+                f"There are {len(rows)} authors named '{value}', "
+                f"use the ID."
+            )
+        return self.to_dicts(self.authors_manager, rows)[0]
+
+    @staticmethod
+    def _get_text(request, manager, key):
+        """
+        Reads a required text field.
+
+        Args:
+            request (dict): The operation.
+            manager (GoogleSheet): The manager which names the columns.
+            key (str): The attribute key.
+
+        Returns:
+            str: The stripped value.
+
+        Raises:
+            ValueError: If the value is empty.
+        """
+        value = BulkImporter.get_field(request, manager, key)
+        if not value:
+            raise ValueError(f"The {key} is required.")
+        return value
+
+    @staticmethod
+    def _get_number(request, manager, key):
+        """
+        Reads a required positive whole number.
+
+        Args:
+            request (dict): The operation.
+            manager (GoogleSheet): The manager which names the columns.
+            key (str): The attribute key.
+
+        Returns:
+            int: The number.
+
+        Raises:
+            ValueError: If the value is not a positive whole number.
+        """
+        number = BulkImporter.parse_positive_int(
+            BulkImporter.get_field(request, manager, key)
+        )
+        if number is None:
+            raise ValueError(f"The {key} has to be a positive whole number.")
+        return number
+
+    def _get_author_id(self, request):
+        """
+        Reads the author of a book given by "author" or "author_id".
+
+        Args:
+            request (dict): The operation.
+
+        Returns:
+            The ID of the author.
+        """
+        author = request.get("author") or request.get("author_id") or ""
+        return self.find_author(author)["id"]
+
+    def list_items(self, request):
+        """
+        Lists all authors or books.
+
+        Args:
+            request (dict): "kind".
+
+        Returns:
+            list: The dictionaries of the items.
+        """
+        return self.to_dicts(self.get_manager(request.get("kind")))
+
+    def find_items(self, request):
+        """
+        Finds authors or books by the ID or a part of the name or title.
+
+        If nothing contains the value, the similar names or titles are
+        returned and "similar" is True.
+
+        Args:
+            request (dict): "kind", "value", optional "limit" and for books
+            an optional "author" (the ID or the full name).
+
+        Returns:
+            dict: "total", "similar" and the found "items".
+        """
+        manager = self.get_manager(request.get("kind"))
+        names = manager.attributes_name
+        value = str(request.get("value") or "").strip()
+        if not value:
+            raise ValueError("The value is required.")
+        name_key = "full_name" if manager is self.authors_manager else "title"
+        attributes_any = {names["id"]: value, names[name_key]: value}
+        attributes_all = {}
+        if manager is self.books_manager and (
+            request.get("author") or request.get("author_id")
+        ):
+            attributes_all[names["author_id"]] = self._get_author_id(request)
+        limit = request.get("limit") or self.limit
+
+        cells = manager.find_cells_contain_value(
+            attributes_any,
+            attributes_all
+        )
+        similar = not cells
+        if similar:
+            cells = manager.find_similar_cells(
+                attributes_any,
+                attributes_all,
+                limit
+            )
+        return {
+            "total": len(cells),
+            "similar": similar,
+            "items": self.to_dicts(
+                manager,
+                [cell[0] for cell in cells[:limit]]
+            ),
+        }
+
+    def get_books_by_author(self, request):
+        """
+        Lists the books of an author.
+
+        Args:
+            request (dict): "author", the ID or the full name.
+
+        Returns:
+            dict: The "author" and the "books".
+        """
+        author = self.find_author(request.get("author") or "")
+        rows = self.books_manager.get_rows_by_value(
+            self.books_manager.attributes_name["author_id"],
+            author["id"]
+        )
+        return {
+            "author": author,
+            "books": self.to_dicts(self.books_manager, rows),
+        }
+
+    def _prepare_add(self, manager, request):
+        """
+        Checks an added item.
+
+        Args:
+            manager (GoogleSheet): The manager of the worksheet.
+            request (dict): For authors "full_name" and "birth_year", for
+            books "title", "shelf_number" and "author" (the ID or the full
+            name).
+
+        Returns:
+            tuple: (attributes, model, values) like the candidates of
+            the bulk import.
+        """
+        names = manager.attributes_name
+        if manager is self.authors_manager:
+            full_name = self._get_text(request, manager, "full_name")
+            birth_year = self._get_number(request, manager, "birth_year")
+            return (
+                {
+                    names["full_name"]: full_name,
+                    names["birth_year"]: birth_year,
+                },
+                Author,
+                (full_name, birth_year),
+            )
+        title = self._get_text(request, manager, "title")
+        shelf_number = self._get_number(request, manager, "shelf_number")
+        author_id = self._get_author_id(request)
+        return (
+            {names["title"]: title, names["author_id"]: author_id},
+            Book,
+            (title, author_id, shelf_number),
+        )
+
+    def _prepare_edit(self, manager, request):
+        """
+        Checks an edit and finds the row of the item.
+
+        Only the given fields are changed.
+
+        Args:
+            manager (GoogleSheet): The manager of the worksheet.
+            request (dict): "id" and the new values of the fields.
+
+        Returns:
+            tuple: (row, attributes, key) the row number, a dictionary
+            where the key is a header and the value is the new value, and
+            the ID of the item by its header.
+        """
+        names = manager.attributes_name
+        item_id = self._get_text(request, manager, "id")
+        rows = manager.get_rows_by_value(names["id"], item_id)
+        if not rows:
+            raise ValueError(f"The ID '{item_id}' is not found.")
+        attributes = {}
+        for key in ("full_name", "title"):
+            if key in names and request.get(key) is not None:
+                attributes[names[key]] = self._get_text(request, manager, key)
+        for key in ("birth_year", "shelf_number"):
+            if key in names and request.get(key) is not None:
+                attributes[names[key]] = self._get_number(
+                    request,
+                    manager,
+                    key
+                )
+        if manager is self.books_manager and (
+            request.get("author") or request.get("author_id")
+        ):
+            attributes[names["author_id"]] = self._get_author_id(request)
+        if not attributes:
+            raise ValueError("No field to change is given.")
+        return rows[0], attributes, {names["id"]: item_id}
+
+    @staticmethod
+    def _new_response(request):
+        """
+        Creates the response of an operation.
+
+        Args:
+            request (dict or str): The operation.
+
+        Returns:
+            dict: The "command" and the "ref" of the operation, if it has
+            one, so the caller can match the responses.
+        """
+        if not isinstance(request, dict):
+            return {"command": None, "ok": False}
+        response = {"command": request.get("command"), "ok": False}
+        if "ref" in request:
+            response["ref"] = request["ref"]
+        return response
+
+    @staticmethod
+    def _fail(response, error):
+        """
+        Marks the response as failed.
+
+        Args:
+            response (dict): The response.
+            error (Exception or str): The reason.
+        """
+        response["ok"] = False
+        response["error"] = str(error)
+
+    def execute(self, request):
+        """
+        Runs one operation.
+
+        Args:
+            request (dict): The operation.
+
+        Returns:
+            dict: The response with "ok" and the "result" or the "error".
+        """
+        command = None
+        if isinstance(request, dict):
+            command = request.get("command")
+        if command in self.WRITE_COMMANDS:
+            return self._run_writes([request])[0]
+        handlers = {
+            "list": self.list_items,
+            "find": self.find_items,
+            "books-by-author": self.get_books_by_author,
+        }
+        response = self._new_response(request)
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("Every line has to be a JSON object.")
+            if command not in handlers:
+                raise ValueError(
+                    f"The command has to be one of: "
+                    f"{', '.join(self.COMMANDS)}."
+                )
+            response["result"] = handlers[command](request)
+            response["ok"] = True
+        except Exception as e:
+            self._fail(response, e)
+        return response
+
+    def _run_writes(self, requests):
+        """
+        Runs consecutive add or edit operations of one kind.
+
+        All operations are checked before any of them is queued, so
+        the reads of the checks do not send the queue. The queue is sent
+        once at the end.
+
+        Args:
+            requests (list): The operations with the same command and kind.
+
+        Returns:
+            list: The responses in the order of the operations.
+        """
+        responses = [self._new_response(request) for request in requests]
+        if not requests:
+            return responses
+        command = requests[0]["command"]
+        try:
+            manager = self.get_manager(requests[0].get("kind"))
+        except ValueError as e:
+            for response in responses:
+                self._fail(response, e)
+            return responses
+
+        prepare = self._prepare_add if command == "add" else self._prepare_edit
+        prepared = []
+        for request, response in zip(requests, responses):
+            try:
+                prepared.append((response, prepare(manager, request)))
+            except Exception as e:
+                self._fail(response, e)
+
+        keys = list(manager.attributes_name)
+        writes = []
+        if command == "add":
+            duplicates = manager.find_duplicates([
+                attributes for _, (attributes, _, _) in prepared
+            ])
+            for (response, (_, model, values)), duplicate in zip(
+                prepared,
+                duplicates
+            ):
+                if duplicate is not None:
+                    self._fail(response, "The item is already in the catalog.")
+                    continue
+                item = model(manager.generate_unique_id(), *values)
+                result = dict(zip(keys, item.to_list()))
+                writes.append((
+                    response,
+                    result,
+                    manager.queue_append_row(item.to_list())
+                ))
+        else:
+            # The cache may be old, so the rows are read in one request
+            live_records = manager.read_live_records([
+                row for _, (row, _, _) in prepared
+            ])
+            for response, (row, attributes, key) in prepared:
+                try:
+                    write = manager.queue_update_fields(
+                        row,
+                        attributes,
+                        key,
+                        live_records[row]
+                    )
+                except KeyError as e:
+                    # The other operations of the batch still run
+                    self._fail(
+                        response,
+                        f"The field {e} is not in the worksheet."
+                    )
+                    continue
+                except ValueError as e:
+                    self._fail(response, e)
+                    continue
+                # Report only the cells which differ and are written
+                positions = manager.get_column_positions(list(attributes))
+                changed = [
+                    attribute
+                    for attribute, position in zip(attributes, positions)
+                    if write is not None and position in write.cells
+                ]
+                result = {"row": row, "changed": changed}
+                writes.append((response, result, write))
+        manager.flush()
+
+        for response, result, write in writes:
+            if write is not None and not write.success:
+                self._fail(response, write.error)
+                continue
+            if write is not None and write.kind == "append":
+                result["row"] = write.row
+            response["result"] = result
+            response["ok"] = True
+        return responses
+
+    def run(self, requests):
+        """
+        Runs the operations in order.
+
+        Args:
+            requests (iterable): The operations.
+
+        Yields:
+            dict: The response of every operation in the same order.
+        """
+        def get_batch_key(request):
+            if not isinstance(request, dict):
+                return None
+            if request.get("command") not in self.WRITE_COMMANDS:
+                return None
+            return request.get("command"), request.get("kind")
+
+        batch = []
+        for request in requests:
+            key = get_batch_key(request)
+            if batch and (
+                key != get_batch_key(batch[0]) or
+                len(batch) >= self.chunk_size
+            ):
+                yield from self._run_writes(batch)
+                batch = []
+            if key is None:
+                yield self.execute(request)
+            else:
+                batch.append(request)
+        yield from self._run_writes(batch)
+
+
+def add_item_arguments(parser):
+    """
+    Adds the options of the fields of an author or a book.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser of the subcommand.
+    """
+    parser.add_argument("--full-name", dest="full_name")
+    parser.add_argument("--birth-year", dest="birth_year")
+    parser.add_argument("--title")
+    parser.add_argument("--shelf-number", dest="shelf_number")
+    parser.add_argument(
+        "--author",
+        help="The ID or the full name of the author of a book.",
+    )
+
+
+def main():
+    """Runs the operation given on the command line or on the input."""
+    from run import open_managers
+
+    parser = argparse.ArgumentParser(
+        description="Run catalog operations and print JSON lines."
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=500,
+        help="The largest number of operations sent in one write.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = subparsers.add_parser("list", help="List all items.")
+    list_parser.add_argument("kind", choices=["authors", "books"])
+
+    find_parser = subparsers.add_parser(
+        "find",
+        help="Find items by the ID or a part of the name or title.",
+    )
+    find_parser.add_argument("kind", choices=["authors", "books"])
+    find_parser.add_argument("value")
+    find_parser.add_argument(
+        "--author",
+        help="Only the books of this author, the ID or the full name.",
+    )
+    find_parser.add_argument("--limit", type=int)
+
+    add_parser = subparsers.add_parser("add", help="Add an item.")
+    add_parser.add_argument("kind", choices=["authors", "books"])
+    add_item_arguments(add_parser)
+
+    edit_parser = subparsers.add_parser(
+        "edit",
+        help="Change the given fields of an item.",
+    )
+    edit_parser.add_argument("kind", choices=["authors", "books"])
+    edit_parser.add_argument("id")
+    add_item_arguments(edit_parser)
+
+    books_parser = subparsers.add_parser(
+        "books-by-author",
+        help="List the books of an author.",
+    )
+    books_parser.add_argument(
+        "author",
+        help="The ID or the full name of the author.",
+    )
+
+    subparsers.add_parser(
+        "batch",
+        help="Run the JSON lines operations of the standard input.",
+    )
+    args = parser.parse_args()
+
+    if args.command == "batch":
+        requests = CatalogCommands.read_requests(sys.stdin)
+    else:
+        # The options which were not given are not part of the operation
+        requests = [{
+            key: value
+            for key, value in vars(args).items()
+            if value is not None and key != "chunk_size"
+        }]
+
+    authors_manager, books_manager = open_managers()
+    commands = CatalogCommands(
+        authors_manager,
+        books_manager,
+        args.chunk_size
+    )
+    failed = CatalogCommands.write_responses(
+        commands.run(requests),
+        sys.stdout
+    )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+import threading
+
+
+class BooksWithAuthorsView:
+    """
+    A materialized join of the books with the full names of their authors.
+
+    The view keeps one author name per cached book row, next to the cached
+    columns of the books. It is built from the caches of both managers the
+    first time it is read and then follows them: appended and updated books
+    and authors change only the affected rows, a reload of either cache
+    rebuilds the view on the next read. Listings and searches are therefore
+    a scan of memory without any request or lookup per row.
+
+    Attributes:
+        books_manager (Books): An instance of the Books class.
+        authors_manager (Authors): An instance of the Authors class.
+    """
+
+    # Shown for books whose author is not in the authors worksheet
+    INVALID_AUTHOR = "Invalid author's ID"
+
+    def __init__(self, books_manager, authors_manager):
+        """
+        Initializes the BooksWithAuthorsView class.
+
+        Args:
+            books_manager (Books): An instance of the Books class.
+            authors_manager (Authors): An instance of the Authors class.
+        """
+        self.books_manager = books_manager
+        self.authors_manager = authors_manager
+        # The listeners may be called from a background revalidation
+        self._lock = threading.RLock()
+        self._author_names = None
+        self._full_names = None
+        books_manager.add_listener(self._on_books_change)
+        authors_manager.add_listener(self._on_authors_change)
+
+    def _build(self):
+        """Joins the cached books with the cached authors."""
+        authors_names = self.authors_manager.attributes_name
+        books_names = self.books_manager.attributes_name
+        author_names = dict(zip(
+            self.authors_manager.get_column(authors_names["id"]),
+            self.authors_manager.get_column(authors_names["full_name"])
+        ))
+        self._full_names = [
+            author_names.get(author_id, self.INVALID_AUTHOR)
+            for author_id in self.books_manager.get_column(
+                books_names["author_id"]
+            )
+        ]
+        self._author_names = author_names
+
+    def _ensure(self):
+        """
+        Loads both caches and builds the view if it is out of date.
+
+        The caller holds the locks of the authors, the books and the view
+        in this order, the same order the listeners take them in.
+        """
+        # Reading the caches may reload them, which drops the view
+        self.books_manager.get_all_records()
+        self.authors_manager.get_all_records()
+        if self._full_names is None:
+            self._build()
+
+    def _drop(self):
+        """Drops the view so the next read builds it again."""
+        self._author_names = None
+        self._full_names = None
+
+    def _on_books_change(self, event, row, record):
+        """
+        Follows a change of the books cache.
+
+        Args:
+            event (str): "append", "update" or "reload".
+            row (int or None): The row number of the changed book.
+            record (dict or None): The new values of the book.
+        """
+        with self._lock:
+            if self._full_names is None:
+                return
+            index = row - 2 if row is not None else None
+            if event == "reload" or not (
+                0 <= index <= len(self._full_names)
+            ):
+                self._drop()
+                return
+            full_name = self._author_names.get(
+                record.get(self.books_manager.attributes_name["author_id"]),
+                self.INVALID_AUTHOR
+            )
+            if index == len(self._full_names):
+                self._full_names.append(full_name)
+            else:
+                self._full_names[index] = full_name
+
+    def _on_authors_change(self, event, row, record):
+        """
+        Follows a change of the authors cache.
+
+        The books of a changed author are found with the hash index of
+        the author IDs of the books.
+
+        Args:
+            event (str): "append", "update" or "reload".
+            row (int or None): The row number of the changed author.
+            record (dict or None): The new values of the author.
+        """
+        with self._lock:
+            if self._full_names is None:
+                return
+            if event == "reload":
+                self._drop()
+                return
+            names = self.authors_manager.attributes_name
+            author_id = record.get(names["id"])
+            if event == "update" and author_id not in self._author_names:
+                # The ID itself was changed, the old ID is not known here
+                self._drop()
+                return
+            full_name = record.get(names["full_name"])
+            self._author_names[author_id] = full_name
+            index = self.books_manager.indexes[
+                self.books_manager.attributes_name["author_id"]
+            ]
+            for book_row in list(index.get(author_id)):
+                if 0 <= book_row - 2 < len(self._full_names):
+                    self._full_names[book_row - 2] = full_name
+
+    def get_author_names(self):
+        """
+        Returns the full names of the authors.
+
+        Returns:
+            dict: A dictionary where the key is the author's ID and
+            the value is the full name. It must not be changed.
+        """
+        with (
+            self.authors_manager._lock,
+            self.books_manager._lock,
+            self._lock
+        ):
+            self._ensure()
+            return self._author_names
+
+    def get_table_columns(self, rows=None):
+        """
+        Returns the columns of the books with the full names of the authors.
+
+        Args:
+            rows (iterable or None): The row numbers of the books in
+            the worksheet. None returns all books.
+
+        Returns:
+            list: The ID, TITLE, AUTHOR and SHELF columns. For all books
+            they are the cached columns, which must not be changed.
+        """
+        names = self.books_manager.attributes_name
+        with (
+            self.authors_manager._lock,
+            self.books_manager._lock,
+            self._lock
+        ):
+            self._ensure()
+            columns = [
+                self.books_manager.get_column(names["id"]),
+                self.books_manager.get_column(names["title"]),
+                self._full_names,
+                self.books_manager.get_column(names["shelf_number"]),
+            ]
+            if rows is None:
+                return columns
+            indexes = [row - 2 for row in rows]
+            return [[column[i] for i in indexes] for column in columns]
+
+    def get_table_rows(self, rows=None):
+        """
+        Returns the books with the full names of their authors.
+
+        Args:
+            rows (iterable or None): The row numbers of the books in
+            the worksheet. None returns all books.
+
+        Returns:
+            list: A list of [ID, TITLE, AUTHOR, SHELF] lists.
+        """
+        # Zip the columns instead of creating the records
+        return [
+            list(values)
+            for values in zip(*self.get_table_columns(rows))
+        ]
@@ -1,38 +1,108 @@
 const Pty = require('node-pty');
 const fs = require('fs');
 
+// Number of warm Python workers waiting for a session, 0 disables the pool
+const POOL_SIZE = parseInt(process.env.LIBRARY_POOL_SIZE || '4');
+// Idle workers older than this are replaced (seconds)
+const POOL_MAX_AGE = parseInt(process.env.LIBRARY_POOL_MAX_AGE || '3600') * 1000;
+// Printed by run.py when the records of an idle worker are loaded
+const READY_MARKER = '\x1b]library-ready\x07';
+
+var idleWorkers = [];
+
 exports.install = function () {
 
     ROUTE('/');
     WEBSOCKET('/', socket, ['raw']);
 
-};
-
-function socket() {
+    fillPool();
+    setInterval(recycleWorkers, 60 * 1000);
 
-    this.encodedecode = false;
-    this.autodestroy();
+};
 
-    this.on('open', function (client) {
+function spawnWorker() {
 
-        // Spawn terminal
-        client.tty = Pty.spawn('python3', ['run.py'], {
+    // Spawn terminal which loads the data and waits for a session
+    var worker = {
+        tty: Pty.spawn('python3', ['run.py'], {
             name: 'xterm-color',
             cols: 80,
             rows: 24,
             cwd: process.env.PWD,
-            env: process.env
-        });
+            env: Object.assign({}, process.env, { LIBRARY_POOLED_WORKER: '1' })
+        }),
+        client: null,
+        ready: false,
+        started: Date.now()
+    };
 
-        client.tty.on('exit', function (code, signal) {
-            client.tty = null;
-            client.close();
+    worker.tty.on('data', function (data) {
+        if (data.indexOf(READY_MARKER) !== -1) {
+            worker.ready = true;
+            data = data.split(READY_MARKER).join('');
+        }
+        // Output of an idle worker is not shown to anybody
+        worker.client && data && worker.client.send(data);
+    });
+
+    worker.tty.on('exit', function (code, signal) {
+        var index = idleWorkers.indexOf(worker);
+        if (index !== -1) {
+            idleWorkers.splice(index, 1);
+        }
+        if (worker.client) {
+            worker.client.tty = null;
+            worker.client.close();
             console.log("Process killed");
-        });
+        }
+        // Wait before replacing a worker which failed to start
+        setTimeout(fillPool, worker.ready ? 0 : 5000);
+    });
+
+    return worker;
+}
 
-        client.tty.on('data', function (data) {
-            client.send(data);
-        });
+function fillPool() {
+    while (idleWorkers.length < POOL_SIZE) {
+        idleWorkers.push(spawnWorker());
+    }
+}
+
+function recycleWorkers() {
+    var now = Date.now();
+    idleWorkers.slice().forEach(function (worker) {
+        if (worker.ready && now - worker.started > POOL_MAX_AGE) {
+            // The exit handler spawns the replacement
+            worker.tty.kill(9);
+        }
+    });
+}
+
+function takeWorker() {
+    // Prefer a warm worker, then one which is still loading, then a new one
+    var index = idleWorkers.findIndex(function (worker) {
+        return worker.ready;
+    });
+    if (index === -1 && idleWorkers.length) {
+        index = 0;
+    }
+    var worker = index === -1 ? spawnWorker() : idleWorkers.splice(index, 1)[0];
+    setImmediate(fillPool);
+    return worker;
+}
+
+function socket() {
+
+    this.encodedecode = false;
+    this.autodestroy();
+
+    this.on('open', function (client) {
+
+        // Attach the session to a worker and let it show the menu
+        var worker = takeWorker();
+        worker.client = client;
+        client.tty = worker.tty;
+        client.tty.write('\r');
 
     });
 
@@ -51,10 +121,10 @@ function socket() {
 
 if (process.env.CREDS != null) {
     console.log("Creating creds.json file.");
-    fs.writeFile('creds.json', process.env.CREDS, 'utf8', function (err) {
-        if (err) {
-            console.log('Error writing file: ', err);
-            socket.emit("console_output", "Error saving credentials: " + err);
-        }
-    });
-}
\ No newline at end of file
+    // Written synchronously, so the pooled workers find it when they start
+    try {
+        fs.writeFileSync('creds.json', process.env.CREDS, 'utf8');
+    } catch (err) {
+        console.log('Error writing file: ', err);
+    }
+}
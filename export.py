@@ -0,0 +1,237 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from colorama import Fore
+from record_store import numericise_column
+
+
+class CatalogExporter:
+    """
+    Exports the catalog to CSV or JSONL files.
+
+    The worksheets are read in pages of fixed A1 ranges and every page is
+    written as soon as it arrives, so the memory used does not depend on
+    the size of the worksheet.
+
+    Attributes:
+        authors_manager (Authors): An instance of the Authors class.
+        books_manager (Books): An instance of the Books class.
+        page_size (int): The number of rows read in one request.
+    """
+
+    def __init__(self, authors_manager, books_manager, page_size=5000):
+        """
+        Initializes the CatalogExporter class.
+
+        Args:
+            authors_manager (Authors): An instance of the Authors class.
+            books_manager (Books): An instance of the Books class.
+            page_size (int): The number of rows read in one request.
+        """
+        self.authors_manager = authors_manager
+        self.books_manager = books_manager
+        self.page_size = page_size
+
+    @staticmethod
+    def get_format(file_path, file_format=None):
+        """
+        Chooses the output format.
+
+        Args:
+            file_path (str): Path to the output file.
+            file_format (str or None): "csv" or "jsonl". If it is None,
+            the format is chosen by the file extension.
+
+        Returns:
+            str: "csv" or "jsonl".
+        """
+        if file_format:
+            return file_format
+        extension = os.path.splitext(file_path)[1].lower()
+        return "jsonl" if extension in (".jsonl", ".ndjson") else "csv"
+
+    @staticmethod
+    def get_positions(manager):
+        """
+        Finds the position of every attribute in the header row.
+
+        The headers are compared without regard to case, like the bulk
+        import does.
+
+        Args:
+            manager (GoogleSheet): The manager of the worksheet.
+
+        Returns:
+            dict: A dictionary where the key is the attribute key and
+            the value is the index of the column.
+
+        Raises:
+            ValueError: If a header is not in the worksheet.
+        """
+        headers = [
+            str(header).strip().lower()
+            for header in manager.sheet.row_values(1)
+        ]
+        positions = {}
+        for key, header in manager.attributes_name.items():
+            if header.lower() not in headers:
+                raise ValueError(
+                    f"The column '{header}' is not in the worksheet "
+                    f"'{manager.sheet.title}'."
+                )
+            positions[key] = headers.index(header.lower())
+        return positions
+
+    def iter_rows(self, manager, positions=None):
+        """
+        Streams the rows of the worksheet as dictionaries of attributes.
+
+        The values of a page are converted to numbers column by column,
+        the same way the cache converts them.
+
+        Args:
+            manager (GoogleSheet): The manager of the worksheet.
+            positions (dict or None): The result of get_positions(). None
+            reads the header row.
+
+        Yields:
+            dict: A dictionary where the key is the attribute key.
+        """
+        if positions is None:
+            positions = self.get_positions(manager)
+        column_count = max(positions.values()) + 1
+        for page in manager.iter_value_pages(column_count, self.page_size):
+            # Blank rows inside the page are skipped
+            rows = [values for values in page if values]
+            columns = {
+                key: numericise_column([
+                    values[index] if index < len(values) else ""
+                    for values in rows
+                ])
+                for key, index in positions.items()
+            }
+            for i in range(len(rows)):
+                yield {key: column[i] for key, column in columns.items()}
+
+    def iter_books(self, positions=None):
+        """
+        Streams the books joined with the full names of the authors.
+
+        Args:
+            positions (dict or None): The result of get_positions() for
+            the books. None reads the header row.
+
+        Yields:
+            dict: The book attributes and "author_full_name".
+        """
+        # The authors are small and are served from the cache
+        authors = self.authors_manager.get_all_authors_dictionary()
+        for book in self.iter_rows(self.books_manager, positions):
+            book["author_full_name"] = authors.get(
+                book["author_id"],
+                "Invalid author's ID"
+            )
+            yield book
+
+    @staticmethod
+    def write(rows, file, file_format, fieldnames):
+        """
+        Writes the rows to the file.
+
+        Args:
+            rows (iterable): The dictionaries to write.
+            file (file object): The opened output file.
+            file_format (str): "csv" or "jsonl".
+            fieldnames (list): The keys of the dictionaries in column order.
+
+        Returns:
+            int: The number of rows written.
+        """
+        count = 0
+        if file_format == "jsonl":
+            for row in rows:
+                file.write(json.dumps(row, ensure_ascii=False) + "\n")
+                count += 1
+        else:
+            writer = csv.DictWriter(file, fieldnames=fieldnames)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        return count
+
+    def export(self, kind, file, file_format):
+        """
+        Exports the authors or the books.
+
+        Args:
+            kind (str): "authors" or "books".
+            file (file object): The opened output file.
+            file_format (str): "csv" or "jsonl".
+
+        Returns:
+            int: The number of rows written.
+
+        Raises:
+            ValueError: If a header is not in the worksheet. Nothing is
+            written then.
+        """
+        if kind == "authors":
+            manager = self.authors_manager
+            # Check the headers before anything is written
+            rows = self.iter_rows(manager, self.get_positions(manager))
+            fieldnames = list(manager.attributes_name)
+        else:
+            manager = self.books_manager
+            rows = self.iter_books(self.get_positions(manager))
+            fieldnames = list(manager.attributes_name) + ["author_full_name"]
+        return self.write(rows, file, file_format, fieldnames)
+
+
+def main():
+    """Exports the catalog to the file given on the command line."""
+    from run import open_managers
+
+    parser = argparse.ArgumentParser(
+        description="Export authors or books to a CSV or JSONL file."
+    )
+    parser.add_argument("kind", choices=["authors", "books"])
+    parser.add_argument(
+        "file",
+        help="Path to the output file or '-' for the standard output.",
+    )
+    parser.add_argument("--format", choices=["csv", "jsonl"])
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=5000,
+        help="The number of rows read in one request.",
+    )
+    args = parser.parse_args()
+
+    # The rows are streamed, so the snapshots are not loaded
+    authors_manager, books_manager = open_managers(load_snapshots=False)
+    exporter = CatalogExporter(
+        authors_manager,
+        books_manager,
+        args.page_size
+    )
+    file_format = CatalogExporter.get_format(args.file, args.format)
+    try:
+        if args.file == "-":
+            count = exporter.export(args.kind, sys.stdout, file_format)
+        else:
+            with open(args.file, "w", newline="", encoding="utf-8") as f:
+                count = exporter.export(args.kind, f, file_format)
+            print(
+                Fore.GREEN + f"Exported {count} {args.kind} to {args.file}."
+            )
+    except ValueError as e:
+        print(Fore.RED + str(e), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
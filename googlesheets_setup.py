@@ -1,146 +1,1592 @@
-import gspread
-from google.oauth2.service_account import Credentials
+import atexit
+import re
+import threading
+import time
+import weakref
 from colorama import Fore
-from simple_term_menu import TerminalMenu
+from indexes import BKTree, HashIndex, KeyIndex, TrigramIndex
+from mixin_classes import InputMixin
+from record_store import ColumnarRecords, numericise_column
+from quota_scheduler import QuotaScheduler, ScheduledWorksheet
+
+# The managers which queued writes, their queues are flushed at exit
+_writing_managers = weakref.WeakSet()
+
+
+def _flush_at_exit():
+    """Flushes the queued writes of all managers before the exit."""
+    for manager in list(_writing_managers):
+        manager.flush()
+
+
+atexit.register(_flush_at_exit)
+
+
+def column_letter(column):
+    """
+    Converts a column number to its letters.
+
+    Args:
+        column (int): The column number, 1 is "A".
+
+    Returns:
+        str: The letters of the column, e.g. "D" or "AB".
+    """
+    letters = ""
+    while column > 0:
+        column, remainder = divmod(column - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
 
 
 class GoogleSheetsClient:
     """
     A client class to handle authentication and connection to Google Sheets.
 
-    Attributes:
-        creds_file (str): Path to the credentials JSON file.
-        client (gspread.Client): An authenticated gspread client.
-    """
+    All API calls go through a QuotaScheduler, so the calls wait for
+    the quota instead of failing.
+
+    Attributes:
+        creds_file (str): Path to the credentials JSON file.
+        client (gspread.Client): An authenticated gspread client.
+        scheduler (QuotaScheduler): The scheduler of the API calls.
+    """
+
+    def __init__(self, creds, api_base_url=None, scheduler=None):
+        """
+        Initializes the GoogleSheetsClient with the given credentials.
+
+        Args:
+            creds (google.oauth2.service_account.Credentials):
+            The credentials for authentication. Not used with api_base_url.
+            api_base_url (str or None): The URL of a local stand-in of
+            the Sheets API. If it is set, no authentication is done.
+            scheduler (QuotaScheduler or None): The scheduler of the API
+            calls. A scheduler with the default quotas is created if it
+            is None.
+        """
+        self.scheduler = scheduler or QuotaScheduler()
+        if api_base_url:
+            # gspread and requests are imported on first use, they take
+            # most of the start-up time
+            import gspread
+            from base_url_session import BaseURLSession
+
+            self.client = gspread.Client(
+                None,
+                session=BaseURLSession(api_base_url)
+            )
+        else:
+            self.client = self.authenticate(creds)
+
+    @staticmethod
+    def get_creds(creds_file):
+        """
+        Generates credentials from the service account file.
+
+        Args:
+            creds_file (str): Path to the credentials JSON file.
+
+        Returns:
+            google.oauth2.service_account.Credentials:
+            The generated credentials.
+        """
+        from google.oauth2.service_account import Credentials
+
+        return Credentials.from_service_account_file(
+            creds_file,
+            scopes=[
+                "https://www.googleapis.com/auth/spreadsheets",
+                "https://www.googleapis.com/auth/drive.file",
+                "https://www.googleapis.com/auth/drive",
+            ],
+        )
+
+    def authenticate(self, creds):
+        """
+        Authenticates the client using the provided credentials.
+
+        Args:
+            creds (google.oauth2.service_account.Credentials):
+            The credentials for authentication.
+
+        Returns:
+            gspread.Client: An authenticated gspread client.
+        """
+        import gspread
+
+        return gspread.authorize(creds)
+
+    def open_worksheet(self, sheet_name, worksheet):
+        """
+        Opens a specific worksheet from a Google Sheet.
+
+        Args:
+            sheet_name (str): The name of the Google Sheet.
+            worksheet (str): The name of the worksheet within the Google Sheet.
+
+        Returns:
+            ScheduledWorksheet: The worksheet object whose calls go through
+            the scheduler.
+        """
+        spreadsheet = self.scheduler.call("read", self.client.open, sheet_name)
+        sheet = self.scheduler.call("read", spreadsheet.worksheet, worksheet)
+        return ScheduledWorksheet(sheet, self.scheduler)
+
+
+class DeferredWorksheet:
+    """
+    A worksheet which is opened in the background.
+
+    The managers can be created before the worksheet is open. The first
+    call of a worksheet method waits until the worksheet is opened.
+
+    Attributes:
+        future (concurrent.futures.Future): The future of the worksheet.
+    """
+
+    def __init__(self, future):
+        """
+        Initializes the DeferredWorksheet class.
+
+        Args:
+            future (concurrent.futures.Future): The future which returns
+            the worksheet.
+        """
+        self.future = future
+        self._columns = None
+        self._lock = threading.Lock()
+
+    def ensure_columns(self, headers):
+        """
+        Remembers the columns until the worksheet is opened.
+
+        Args:
+            headers (list): The headers of the columns.
+        """
+        self._columns = list(headers)
+
+    def resolve(self):
+        """
+        Waits until the worksheet is opened.
+
+        Returns:
+            gspread.models.Worksheet: The worksheet object.
+        """
+        sheet = self.future.result()
+        with self._lock:
+            # Create the columns once if the backend supports it
+            if self._columns and hasattr(sheet, "ensure_columns"):
+                sheet.ensure_columns(self._columns)
+            self._columns = None
+        return sheet
+
+    def __getattr__(self, name):
+        """
+        Forwards the other attributes to the opened worksheet.
+
+        Args:
+            name (str): The name of the attribute.
+
+        Returns:
+            The attribute of the worksheet.
+        """
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+
+class WriteResult:
+    """
+    The result of a write queued in GoogleSheet.
+
+    Attributes:
+        kind (str): "append" or "update".
+        values (list): The values of the row.
+        row (int or None): The row number. For appends it is known after
+        the write is sent.
+        cells (dict or None): For an update of single cells a dictionary
+        where the key is the column number and the value is the new value.
+        None writes the whole row.
+        queued_at (float): The monotonic time when the write was queued.
+        done (bool): True when the write was sent to the worksheet.
+        success (bool): True if the write was saved.
+        error (Exception or None): The error if the write failed.
+    """
+
+    def __init__(self, kind, values, row=None, cells=None):
+        """
+        Initializes the WriteResult class.
+
+        Args:
+            kind (str): "append" or "update".
+            values (list): The values of the row.
+            row (int or None): The row number of an update.
+            cells (dict or None): The changed cells of an update by their
+            column numbers.
+        """
+        self.kind = kind
+        self.values = values
+        self.row = row
+        self.cells = cells
+        self.queued_at = time.monotonic()
+        self.done = False
+        self.success = False
+        self.error = None
+
+    def set_result(self, success, error=None, row=None):
+        """
+        Stores the outcome of the write.
+
+        Args:
+            success (bool): True if the write was saved.
+            error (Exception or None): The error if the write failed.
+            row (int or None): The row number where the values were saved.
+        """
+        self.done = True
+        self.success = success
+        self.error = error
+        if row is not None:
+            self.row = row
+
+
+class GoogleSheet:
+    """
+    A class to handle operations on a specific Google Sheet worksheet.
+
+    The records of the worksheet are kept in a read-through cache of
+    ColumnarRecords. The cache is reloaded when it is older than cache_ttl
+    seconds and is updated in place (write-through) after every successful
+    append or update, so most user actions do not download the worksheet
+    again.
+
+    Exact-match columns such as IDs can be backed by hash indexes and text
+    columns by trigram indexes. Uniqueness keys of several columns get key
+    indexes, so duplicates are found without a scan. Names and titles can
+    get BK-trees which find misspelled values. The indexes are kept
+    together with the cache.
+
+    Writes can be queued. Queued appends and updates are sent together as
+    one append_rows and one batch_update call when the queue reaches
+    write_batch_size, when the oldest write is older than write_max_age
+    seconds or when flush() is called. A background timer flushes a write
+    which waits for write_max_age seconds, reads flush the queue first and
+    the remaining writes are flushed when the program exits.
+
+    When the worksheet reports the revision of the spreadsheet, an expired
+    cache is checked against it. If the revision is the same, the cache
+    is kept, otherwise the whole worksheet is reloaded. After its own
+    writes the cache takes the new revision only if the version grew by
+    the number of its write calls, so a change by somebody else before or
+    after them makes the next read reload the worksheet.
+
+    With a SnapshotStore, the records are saved to a local file with their
+    revision. A new process loads them at once and revalidates them in
+    a background thread.
+
+    Listeners added with add_listener() are told about every change of
+    the cache, so views built from the records can follow it.
+
+    Attributes:
+        sheet (gspread.models.Worksheet): The worksheet object.
+        cache_ttl (float or None): The number of seconds the cached records
+        stay valid. None means the cache never expires on its own.
+        full_refresh_interval (float or None): The number of seconds after
+        which the whole worksheet is reloaded even if the revision is
+        the same. None disables the revision checks.
+        indexes (dict): A dictionary where the key is a header and the value
+        is the HashIndex of the column.
+        substring_indexes (dict): A dictionary where the key is a header and
+        the value is the TrigramIndex of the column.
+        unique_indexes (dict): A dictionary where the key is the frozenset
+        of the headers of a uniqueness key and the value is its KeyIndex.
+        fuzzy_indexes (dict): A dictionary where the key is a header and
+        the value is the BKTree of the column.
+        write_batch_size (int): The number of queued writes which triggers
+        a flush.
+        write_max_age (float): The age in seconds of the oldest queued write
+        which triggers a flush.
+        snapshot_store (SnapshotStore or None): The local store of
+        the records.
+        snapshot_name (str or None): The name of the snapshot in the store.
+    """
+
+    # The number of matches shown at once by choose_item
+    CHOOSE_PAGE_SIZE = 20
+
+    def __init__(
+        self,
+        sheet,
+        cache_ttl=300,
+        indexed_attributes=(),
+        substring_indexed_attributes=(),
+        write_batch_size=500,
+        write_max_age=5,
+        headers=None,
+        full_refresh_interval=3600,
+        snapshot_store=None,
+        snapshot_name=None,
+        unique_keys=(),
+        fuzzy_indexed_attributes=()
+    ):
+        """
+        Initializes the GoogleSheet class with a worksheet object.
+
+        Args:
+            sheet (gspread.models.Worksheet): The worksheet object.
+            cache_ttl (float or None): The number of seconds the cached
+            records stay valid. None means the cache never expires.
+            indexed_attributes (iterable): The headers of the columns which
+            are matched exactly and get a hash index.
+            substring_indexed_attributes (iterable): The headers of the
+            columns which are searched by a part of the value and get
+            a trigram index.
+            write_batch_size (int): The number of queued writes which
+            triggers a flush.
+            write_max_age (float): The age in seconds of the oldest queued
+            write which triggers a flush.
+            headers (list or None): The headers of the model. Local storage
+            backends create their tables from them.
+            full_refresh_interval (float or None): The number of seconds
+            after which the whole worksheet is reloaded. None disables
+            the revision checks.
+            snapshot_store (SnapshotStore or None): The local store of
+            the records.
+            snapshot_name (str or None): The name of the snapshot in
+            the store, e.g. "authors".
+            unique_keys (iterable): The uniqueness keys. Every key is
+            a tuple of the headers of the columns which together identify
+            a record.
+            fuzzy_indexed_attributes (iterable): The headers of the text
+            columns which are searched with typos and get a BK-tree.
+        """
+        self.sheet = sheet
+        self.cache_ttl = cache_ttl
+        self.full_refresh_interval = full_refresh_interval
+        self.indexes = {
+            attribute: HashIndex(attribute)
+            for attribute in indexed_attributes
+        }
+        self.substring_indexes = {
+            attribute: TrigramIndex(attribute)
+            for attribute in substring_indexed_attributes
+        }
+        self.unique_indexes = {
+            frozenset(key): KeyIndex(key) for key in unique_keys
+        }
+        self.fuzzy_indexes = {
+            attribute: BKTree(attribute)
+            for attribute in fuzzy_indexed_attributes
+        }
+        self.write_batch_size = write_batch_size
+        self.write_max_age = write_max_age
+        self.snapshot_store = snapshot_store
+        self.snapshot_name = snapshot_name
+        # The cache is shared with the background revalidation
+        self._lock = threading.RLock()
+        self._write_count = 0
+        self._pending_writes = []
+        self._headers = []
+        self._records = None
+        self._loaded_at = None
+        self._revision = None
+        self._refreshed_at = None
+        self._listeners = []
+        if headers and hasattr(sheet, "ensure_columns"):
+            # A local backend creates the table on demand
+            sheet.ensure_columns(headers)
+
+    def is_cache_valid(self):
+        """
+        Checks whether the cached records can be used.
+
+        Returns:
+            bool: True if the records are cached and not expired.
+        """
+        if self._records is None:
+            return False
+        if self._loaded_at == float("-inf"):
+            return False
+        if self.cache_ttl is None:
+            return True
+        return time.monotonic() - self._loaded_at < self.cache_ttl
+
+    def refresh(self):
+        """
+        Downloads all records from the worksheet and replaces the cache.
+
+        Returns:
+            ColumnarRecords: The records, a sequence of read-only mappings.
+        """
+        with self._lock:
+            self._set_records(*self._download())
+            self.save_snapshot()
+            return self._records
+
+    def _download(self):
+        """
+        Downloads all records from the worksheet.
+
+        The values are read as rows and stored by position, so no
+        dictionary is built for a row. The positions of the columns are
+        taken from the header row of every download, so the columns can be
+        moved in the worksheet.
+
+        Returns:
+            tuple: (revision, headers, records).
+        """
+        # The revision is read first, so later changes are not missed
+        revision = self.get_revision()
+        values = self.sheet.get_all_values()
+        headers = values[0] if values else []
+        # Convert the values column by column like get_all_records does
+        return revision, headers, ColumnarRecords.from_rows(
+            headers,
+            values[1:],
+            convert=numericise_column
+        )
+
+    def _set_records(self, revision, headers, records, indexes=None):
+        """
+        Replaces the cache and its indexes.
+
+        Args:
+            revision (tuple or None): The revision of the records.
+            headers (list): The headers of the worksheet.
+            records (list or ColumnarRecords): The records.
+            indexes (dict or None): The indexes built by _build_indexes()
+            from the records. None builds them now.
+        """
+        if not isinstance(records, ColumnarRecords):
+            records = ColumnarRecords.from_records(headers, records)
+        if indexes is None:
+            indexes = self._build_indexes(records)
+        self._headers = headers
+        self._records = records
+        self._loaded_at = time.monotonic()
+        self._refreshed_at = self._loaded_at
+        self._revision = revision
+        for name, value in indexes.items():
+            setattr(self, name, value)
+        self._notify("reload")
+
+    def add_listener(self, listener):
+        """
+        Registers a function which is called when the cache changes.
+
+        The listener is called with the event, the row number and
+        the record. The event is "append" or "update" for one row and
+        "reload" when the whole cache was replaced or dropped, then the row
+        and the record are None. It is called while the cache is locked,
+        so it must not send any request.
+
+        Args:
+            listener (callable): The function to call.
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, event, row=None, record=None):
+        """
+        Calls the listeners of the cache.
+
+        Args:
+            event (str): "append", "update" or "reload".
+            row (int or None): The row number of the changed record.
+            record (dict or None): The new values of the record.
+        """
+        for listener in self._listeners:
+            listener(event, row, record)
+
+    def load_snapshot(self):
+        """
+        Loads the records from the snapshot store without any request.
+
+        Returns:
+            bool: True if a snapshot was loaded.
+        """
+        if self.snapshot_store is None:
+            return False
+        snapshot = self.snapshot_store.load(self.snapshot_name)
+        if snapshot is None:
+            return False
+        records = ColumnarRecords.from_rows(
+            snapshot["headers"],
+            snapshot["rows"]
+        )
+        indexes = self._build_indexes(records)
+        with self._lock:
+            self._set_records(
+                snapshot["revision"],
+                snapshot["headers"],
+                records,
+                indexes
+            )
+        return True
+
+    def save_snapshot(self):
+        """
+        Saves the cached records to the snapshot store.
+
+        It is called after a full download, never after a write, so
+        the writes do not rewrite the whole snapshot.
+        """
+        if (
+            self.snapshot_store is None
+            or self._records is None
+            or self._revision is None
+        ):
+            return
+        self.snapshot_store.save(
+            self.snapshot_name,
+            self._revision,
+            self._headers,
+            self._records.iter_rows()
+        )
+
+    def revalidate(self):
+        """
+        Checks the cached records against the worksheet.
+
+        It is meant to run in a background thread after load_snapshot().
+        The requests are sent and the new indexes are built without
+        holding the lock, so the records of the snapshot can be used in
+        the meantime. The cache is replaced only if the worksheet was
+        changed.
+        """
+        revision = self.get_revision()
+        with self._lock:
+            if self._records is not None and revision is not None and (
+                revision == self._revision
+            ):
+                # The snapshot is up to date
+                self._loaded_at = time.monotonic()
+                return
+            write_count = self._write_count
+        downloaded = self._download()
+        # The indexes are built before the lock, so reads are not blocked
+        indexes = self._build_indexes(downloaded[2])
+        with self._lock:
+            if self._write_count != write_count:
+                # The download may miss the writes made in the meantime and
+                # the cached revision may not include them, reload both
+                self.invalidate()
+                return
+            self._set_records(*downloaded, indexes)
+            self.save_snapshot()
+
+    def get_revision(self):
+        """
+        Reads the revision of the spreadsheet if the worksheet reports it.
+
+        Returns:
+            tuple or None: The revision or None if the revision is not
+            checked.
+        """
+        if self.full_refresh_interval is None:
+            return None
+        get_revision = getattr(self.sheet, "get_revision", None)
+        return get_revision() if get_revision else None
+
+    def sync(self):
+        """
+        Brings the cache up to date without downloading all rows.
+
+        Only the revision of the spreadsheet is read. If it is the same,
+        the cache is kept. The revision does not tell which cells were
+        changed, so any change reloads the whole worksheet.
+
+        Returns:
+            bool: True if the cache is up to date, False if the whole
+            worksheet has to be reloaded.
+        """
+        if self._records is None or self._revision is None:
+            return False
+        if (
+            time.monotonic() - self._refreshed_at >
+            self.full_refresh_interval
+        ):
+            return False
+        revision = self.get_revision()
+        if revision != self._revision:
+            return False
+        self._loaded_at = time.monotonic()
+        return True
+
+    @staticmethod
+    def _same_values(values, expected):
+        """
+        Compares a row read from the worksheet with the cached values.
+
+        Args:
+            values (list): The values read from the worksheet.
+            expected (list): The cached values.
+
+        Returns:
+            bool: True if the values are the same as text.
+        """
+        def as_text(row):
+            row = ["" if value is None else str(value) for value in row]
+            # The API does not return the empty cells at the end
+            while row and row[-1] == "":
+                row.pop()
+            return row
+
+        return as_text(values) == as_text(expected)
+
+    def _build_indexes(self, records):
+        """
+        Builds new indexes of the records.
+
+        The cache and its current indexes are not touched, so a background
+        revalidation builds the indexes without the lock and swaps them in
+        together with the records.
+
+        Args:
+            records (ColumnarRecords): The records.
+
+        Returns:
+            dict: The new "indexes", "substring_indexes", "unique_indexes"
+            and "fuzzy_indexes" dictionaries.
+        """
+        def column(attribute):
+            # Read the column directly instead of creating the row views
+            values = records.column(attribute)
+            return [""] * len(records) if values is None else values
+
+        indexes = {}
+        for attribute in self.indexes:
+            index = indexes[attribute] = HashIndex(attribute)
+            for row, value in enumerate(column(attribute), start=2):
+                index.add(row, value)
+        substring_indexes = {}
+        for attribute in self.substring_indexes:
+            index = substring_indexes[attribute] = TrigramIndex(attribute)
+            index.build(column(attribute))
+        unique_indexes = {}
+        for key, old_index in self.unique_indexes.items():
+            index = unique_indexes[key] = KeyIndex(old_index.attributes)
+            columns = [column(attribute) for attribute in index.attributes]
+            for row, values in enumerate(zip(*columns), start=2):
+                index.add(row, values)
+        return {
+            "indexes": indexes,
+            "substring_indexes": substring_indexes,
+            "unique_indexes": unique_indexes,
+            # The trees are built on the first fuzzy search
+            "fuzzy_indexes": {
+                attribute: BKTree(attribute)
+                for attribute in self.fuzzy_indexes
+            },
+        }
+
+    def get_column(self, attribute):
+        """
+        Returns the cached values of a column without creating records.
+
+        Args:
+            attribute (str): The header of the column.
+
+        Returns:
+            array or list: The values in row order, which must not be
+            changed. Empty if there is no such column.
+        """
+        with self._lock:
+            column = self.get_all_records().column(attribute)
+            return [] if column is None else column
+
+    def get_column_positions(self, attributes):
+        """
+        Finds the column numbers of the headers.
+
+        The header row is read once if no records were loaded yet.
+
+        Args:
+            attributes (list): The headers of the columns.
+
+        Returns:
+            list: The column numbers, 1 is "A". None for a header which is
+            not in the worksheet.
+        """
+        with self._lock:
+            if not self._headers:
+                self._headers = self.sheet.row_values(1)
+            return [
+                self._headers.index(attribute) + 1
+                if attribute in self._headers else None
+                for attribute in attributes
+            ]
+
+    def can_read_projection(self):
+        """
+        Checks whether only some columns or rows should be downloaded.
+
+        Returns:
+            bool: True if no records are cached and the worksheet can read
+            several ranges at once. Loaded records, even expired ones, are
+            synced instead.
+        """
+        return self._records is None and hasattr(self.sheet, "batch_get")
+
+    def read_columns(self, attributes):
+        """
+        Reads only some columns of the worksheet.
+
+        When no records are cached, just the columns are downloaded in one
+        batch_get request, so the other columns are neither transferred nor
+        decoded. The values are not cached. Otherwise the cached columns
+        are returned.
+
+        Args:
+            attributes (list): The headers of the columns.
+
+        Returns:
+            list: The columns in the order of the headers. Every column is
+            a sequence of values in row order, which must not be changed.
+        """
+        with self._lock:
+            if self._pending_writes:
+                self.flush()
+            if not self.can_read_projection():
+                return [self.get_column(attribute) for attribute in attributes]
+
+            from gspread.utils import numericise_all
+
+            positions = self.get_column_positions(attributes)
+            ranges = [
+                f"{column_letter(position)}2:{column_letter(position)}"
+                for position in positions if position
+            ]
+            value_ranges = iter(
+                self.sheet.batch_get(ranges, major_dimension="COLUMNS")
+                if ranges else []
+            )
+            columns = []
+            for position in positions:
+                values = next(value_ranges) if position else []
+                # Convert the values like get_all_records does
+                columns.append(numericise_all(values[0]) if values else [])
+            # The API does not return the empty cells at the end of a column
+            length = max((len(column) for column in columns), default=0)
+            return [
+                column + [""] * (length - len(column)) for column in columns
+            ]
+
+    def get_tuples(self, attributes, rows=None):
+        """
+        Returns the values of some columns as tuples, one for every row.
+
+        The positions of the columns are resolved once, so no record is
+        created and no header is looked up for a row.
+
+        Args:
+            attributes (list): The headers of the columns.
+            rows (list or None): The row numbers of the worksheet. None
+            returns all rows.
+
+        Returns:
+            list: Tuples of the values in the order of the headers.
+        """
+        with self._lock:
+            if rows is not None and self.can_read_projection():
+                if self._pending_writes:
+                    self.flush()
+                positions = self.get_column_positions(attributes)
+                return [
+                    tuple(
+                        values[position - 1]
+                        if position and position <= len(values) else ""
+                        for position in positions
+                    )
+                    for values in self._read_rows(rows)
+                ]
+
+            records = self.get_all_records()
+            columns = [
+                records.column(attribute) or [""] * len(records)
+                for attribute in attributes
+            ]
+            if rows is None:
+                return list(zip(*columns))
+            return [
+                tuple(column[row - 2] for column in columns) for row in rows
+            ]
+
+    def _read_rows(self, rows):
+        """
+        Downloads some rows in one batch_get request.
+
+        Args:
+            rows (list): The row numbers of the worksheet.
+
+        Returns:
+            list: The values of every row in the order of the headers.
+        """
+        if not rows:
+            return []
+
+        from gspread.utils import numericise_all
+
+        # Make sure the headers are known
+        self.get_column_positions([])
+        last_column = column_letter(len(self._headers))
+        value_ranges = self.sheet.batch_get(
+            [f"A{row}:{last_column}{row}" for row in rows]
+        )
+        # Convert the values like get_all_records does
+        return [
+            numericise_all(values[0]) if values else []
+            for values in value_ranges
+        ]
+
+    def get_records(self, rows):
+        """
+        Returns the records of some rows.
+
+        When no records are cached, just the rows are downloaded in one
+        batch_get request. Otherwise they are taken from the cache.
+
+        Args:
+            rows (list): The row numbers of the worksheet.
+
+        Returns:
+            list: The records in the order of the rows.
+        """
+        with self._lock:
+            if self._pending_writes:
+                self.flush()
+            if not self.can_read_projection():
+                records = self.get_all_records()
+                return [records[row - 2] for row in rows]
+            return [
+                self._values_to_record(values)
+                for values in self._read_rows(rows)
+            ]
+
+    def _all_indexes(self):
+        """
+        Returns all hash and trigram indexes.
+
+        Returns:
+            list: A list of the index objects.
+        """
+        return (
+            list(self.indexes.values()) +
+            list(self.substring_indexes.values())
+        )
+
+    def _index_record(self, row, record):
+        """
+        Adds the record to the indexes.
+
+        Args:
+            row (int): The row number of the record.
+            record (dict): The record.
+        """
+        for index in self._all_indexes():
+            index.add(row, record.get(index.attribute, ""))
+        for index in self.unique_indexes.values():
+            index.add(row, [
+                record.get(attribute, "") for attribute in index.attributes
+            ])
+        for index in self.fuzzy_indexes.values():
+            index.add(row, record.get(index.attribute, ""))
+
+    def _unindex_record(self, row, record):
+        """
+        Removes the record from the indexes.
+
+        Args:
+            row (int): The row number of the record.
+            record (dict): The record.
+        """
+        for index in self._all_indexes():
+            index.remove(row, record.get(index.attribute, ""))
+        for index in self.unique_indexes.values():
+            index.remove(row, [
+                record.get(attribute, "") for attribute in index.attributes
+            ])
+        for index in self.fuzzy_indexes.values():
+            index.remove(row, record.get(index.attribute, ""))
+
+    def get_rows_by_value(self, attribute, value):
+        """
+        Finds the rows where the indexed column is equal to the value.
+
+        When no records are cached, only the column is downloaded and
+        scanned instead of the whole worksheet.
+
+        Args:
+            attribute (str): The header of an indexed column.
+            value (str or int): The value being looked up.
+
+        Returns:
+            list: A sorted list of row numbers.
+        """
+        with self._lock:
+            if not self._pending_writes and self.can_read_projection():
+                index = self.indexes[attribute]
+                key = index.normalize(value)
+                column = self.read_columns([attribute])[0]
+                return [
+                    row
+                    for row, cell in enumerate(column, start=2)
+                    if index.normalize(cell) == key
+                ]
+            # Make sure the cache and the indexes are loaded
+            self.get_all_records()
+            return sorted(self.indexes[attribute].get(value))
+
+    def invalidate(self):
+        """Drops the cached records so the next read downloads them."""
+        self._records = None
+        self._loaded_at = None
+        self._revision = None
+        self._notify("reload")
+
+    def expire(self):
+        """Keeps the cached records but makes the next read sync them."""
+        if self._records is not None:
+            self._loaded_at = float("-inf")
+
+    def get_all_records(self):
+        """
+        Retrieves all records from the worksheet.
+
+        The records are served from the cache while it is valid.
+        The returned records are shared with the cache and must not be
+        changed. Queued writes are flushed first, so the records include
+        them.
+
+        Returns:
+            ColumnarRecords: The records, a sequence of read-only mappings
+            like the dictionaries of gspread.
+        """
+        with self._lock:
+            if self._pending_writes:
+                self.flush()
+            return self._load_records()
+
+    def _load_records(self):
+        """
+        Syncs or downloads the records if the cache is not valid.
+
+        Queued writes are flushed only if they are due.
+
+        Returns:
+            ColumnarRecords: The cached records.
+        """
+        with self._lock:
+            self.flush_if_due()
+            if not self.is_cache_valid() and not self.sync():
+                self.refresh()
+            return self._records
+
+    def iter_value_pages(self, column_count, page_size=5000):
+        """
+        Reads the rows of the worksheet page by page.
+
+        Every page is one request for a fixed A1 range (A2:D5001,
+        A5002:D10001, ...), so the worksheet is never loaded at once.
+        The values are not cached. The API drops the blank rows at the end
+        of a range, so a short page does not mean the end of the worksheet.
+        The reading stops at the first page without any value.
+
+        Args:
+            column_count (int): The number of columns to read.
+            page_size (int): The number of rows in one page.
+
+        Yields:
+            list: The rows of the next page. Every row is a list of values.
+        """
+        last_column = column_letter(column_count)
+        start = 2
+        while True:
+            end = start + page_size - 1
+            rows = self.sheet.get(f"A{start}:{last_column}{end}")
+            if not any(rows):
+                # gspread returns [[]] for a range without values
+                break
+            yield rows
+            start = end + 1
+
+    def _values_to_record(self, values_list):
+        """
+        Converts a list of values into a record keyed by the headers.
+
+        Args:
+            values_list (list): The list of values of a row.
+
+        Returns:
+            dict: The record. Missing values are empty strings.
+        """
+        return {
+            header: values_list[i] if i < len(values_list) else ""
+            for i, header in enumerate(self._headers)
+        }
+
+    def _cache_update(self, row, values_list):
+        """
+        Writes an updated row through to the cache.
+
+        Args:
+            row (int): The row number of the worksheet.
+            values_list (list): The new values of the row.
+        """
+        if self._records is None:
+            return
+        index = row - 2
+        if 0 <= index < len(self._records):
+            record = self._values_to_record(values_list)
+            self._unindex_record(row, self._records[index])
+            self._records[index] = record
+            self._index_record(row, record)
+            self._notify("update", row, record)
+        else:
+            # The row is not known to the cache, reload it on the next read
+            self.invalidate()
+
+    def _cache_append(self, values, row=None):
+        """
+        Writes an appended row through to the cache.
+
+        Args:
+            values (list): The values of the new row.
+            row (int or None): The row number where the values were saved
+            if the worksheet reported it.
+        """
+        if self._records is None:
+            return
+        if row is not None and row != len(self._records) + 2:
+            # The worksheet was changed by somebody else, reload it
+            self.invalidate()
+            return
+        record = self._values_to_record(values)
+        self._records.append(record)
+        self._index_record(len(self._records) + 1, record)
+        self._notify("append", len(self._records) + 1, record)
+
+    def update_row(self, row, values_list):
+        """
+        Updates a row in the worksheet.
+
+        The update is sent at once together with any queued writes.
+
+        Args:
+            row (int): The row number of the cell.
+            values_list (list): The list of values to set in the cells.
+
+        Returns:
+            bool: True if the row was updated successfully, False otherwise.
+        """
+        result = self.queue_update_row(row, values_list)
+        self.flush()
+        if result.success:
+            print(Fore.GREEN + "Row updated successfully.")
+        else:
+            print(Fore.RED + f"Failed to update row: {result.error}")
+        return result.success
+
+    def update_fields(self, row, attributes, key=None):
+        """
+        Updates the changed cells of a row in the worksheet.
+
+        The update is sent at once together with any queued writes. If no
+        value was changed, nothing is sent.
+
+        Args:
+            row (int): The row number of the cells.
+            attributes (dict): A dictionary where the key is a header and
+            the value is the new value.
+            key (dict or None): The headers and values which identify
+            the record in the row.
 
-    def __init__(self, creds):
+        Returns:
+            bool: True if the row was updated or had no changes, False
+            otherwise.
         """
-        Initializes the GoogleSheetsClient with the given credentials.
+        try:
+            result = self.queue_update_fields(row, attributes, key)
+        except ValueError as e:
+            print(Fore.RED + f"Failed to update row: {e}")
+            return False
+        if result is None:
+            print(Fore.YELLOW + "Nothing was changed.")
+            return True
+        self.flush()
+        if result.success:
+            print(Fore.GREEN + "Row updated successfully.")
+        else:
+            print(Fore.RED + f"Failed to update row: {result.error}")
+        return result.success
+
+    def append_row(self, values):
+        """
+        Appends a new row to the worksheet.
+
+        The row is sent at once together with any queued writes.
 
         Args:
-            creds (google.oauth2.service_account.Credentials):
-            The credentials for authentication.
+            values (list): A list of values to append as a new row.
+
+        Returns:
+            bool: True if the row was appended successfully, False otherwise.
         """
-        self.client = self.authenticate(creds)
+        result = self.queue_append_row(values)
+        self.flush()
+        if result.success:
+            print(Fore.GREEN + "Row appended successfully.")
+        else:
+            print(Fore.RED + f"Failed to append row: {result.error}")
+        return result.success
 
-    @staticmethod
-    def get_creds(creds_file):
+    def queue_update_row(self, row, values_list):
         """
-        Generates credentials from the service account file.
+        Queues an update of a row.
 
         Args:
-            creds_file (str): Path to the credentials JSON file.
+            row (int): The row number of the cell.
+            values_list (list): The list of values to set in the cells.
 
         Returns:
-            google.oauth2.service_account.Credentials:
-            The generated credentials.
+            WriteResult: The result which is filled in when the queue is
+            flushed.
         """
-        return Credentials.from_service_account_file(
-            creds_file,
-            scopes=[
-                "https://www.googleapis.com/auth/spreadsheets",
-                "https://www.googleapis.com/auth/drive.file",
-                "https://www.googleapis.com/auth/drive",
-            ],
-        )
+        return self._queue_write(WriteResult("update", values_list, row))
 
-    def authenticate(self, creds):
+    def read_live_records(self, rows):
         """
-        Authenticates the client using the provided credentials.
+        Reads some rows from the worksheet instead of the cache.
+
+        All rows are read in one batch_get request. Edits are compared
+        with these records, because the cache may be older than
+        the worksheet.
 
         Args:
-            creds (google.oauth2.service_account.Credentials):
-            The credentials for authentication.
+            rows (list): The row numbers of the worksheet.
 
         Returns:
-            gspread.Client: An authenticated gspread client.
+            dict: The records by their row numbers. A row without values
+            has a record of empty strings.
         """
-        return gspread.authorize(creds)
+        with self._lock:
+            return {
+                row: self._values_to_record(values)
+                for row, values in zip(rows, self._read_rows(rows))
+            }
 
-    def open_worksheet(self, sheet_name, worksheet):
+    def queue_update_fields(self, row, attributes, key=None, live=None):
         """
-        Opens a specific worksheet from a Google Sheet.
+        Queues an update of the changed cells of a row.
+
+        The row is read from the worksheet and the new values are compared
+        with it as text. Only the cells which differ are written, at
+        the columns of their headers, so other columns of the row are not
+        touched. If the row no longer holds the record given by the key,
+        for example because a row above it was deleted, nothing is written.
 
         Args:
-            sheet_name (str): The name of the Google Sheet.
-            worksheet (str): The name of the worksheet within the Google Sheet.
+            row (int): The row number of the cells.
+            attributes (dict): A dictionary where the key is a header and
+            the value is the new value.
+            key (dict or None): The headers and values which identify
+            the record, e.g. {"ID": "b1"}. None does not check the row.
+            live (dict or None): The record of the row returned by
+            read_live_records(). None reads the row.
 
         Returns:
-            gspread.models.Worksheet: The worksheet object.
+            WriteResult or None: The queued write or None if no value
+            was changed.
+
+        Raises:
+            KeyError: If a header is not in the worksheet.
+            ValueError: If the row holds another record.
         """
-        return self.client.open(sheet_name).worksheet(worksheet)
+        with self._lock:
+            if live is None:
+                live = self.read_live_records([row])[row]
+            if key and not self._same_values(
+                [live.get(attribute, "") for attribute in key],
+                list(key.values())
+            ):
+                raise ValueError(
+                    f"Row {row} holds another record now. "
+                    "Search for the item again."
+                )
+            self._check_cached_record(row, live)
+            record = live
+            if any(
+                result.kind == "update" and result.row == row
+                for result in self._pending_writes
+            ):
+                # The queued update is not in the worksheet yet
+                record = {}
+            positions = self.get_column_positions(list(attributes))
+            cells = {}
+            for (attribute, value), position in zip(
+                attributes.items(),
+                positions
+            ):
+                if position is None:
+                    raise KeyError(attribute)
+                if record and self._same_values(
+                    [record.get(attribute, "")],
+                    [value]
+                ):
+                    continue
+                cells[position] = value
+            if not cells:
+                return None
+            values = [
+                cells.get(i, live.get(header, ""))
+                for i, header in enumerate(self._headers, start=1)
+            ]
+            return self._queue_write(
+                WriteResult("update", values, row, cells)
+            )
 
+    def _check_cached_record(self, row, live):
+        """
+        Makes the next read reload the cache if the row was changed.
 
-class GoogleSheet:
-    """
-    A class to handle operations on a specific Google Sheet worksheet.
+        Args:
+            row (int): The row number of the worksheet.
+            live (dict): The record read from the worksheet.
+        """
+        if self._records is None:
+            return
+        index = row - 2
+        cached = {}
+        if 0 <= index < len(self._records):
+            cached = self._records[index]
+        if not self._same_values(
+            [cached.get(header, "") for header in self._headers],
+            [live.get(header, "") for header in self._headers]
+        ):
+            # Somebody else changed the row
+            self._forget_revision()
 
-    Attributes:
-        sheet (gspread.models.Worksheet): The worksheet object.
-    """
+    def queue_append_row(self, values):
+        """
+        Queues a new row to append.
+
+        Args:
+            values (list): A list of values to append as a new row.
 
-    def __init__(self, sheet):
+        Returns:
+            WriteResult: The result which is filled in when the queue is
+            flushed.
         """
-        Initializes the GoogleSheet class with a worksheet object.
+        return self._queue_write(WriteResult("append", values))
+
+    def _queue_write(self, result):
+        """
+        Adds the write to the queue and flushes the queue if it is due.
 
         Args:
-            sheet (gspread.models.Worksheet): The worksheet object.
+            result (WriteResult): The queued write.
+
+        Returns:
+            WriteResult: The queued write.
         """
-        self.sheet = sheet
+        with self._lock:
+            self._pending_writes.append(result)
+            if len(self._pending_writes) == 1:
+                self._start_flush_timer()
+            self.flush_if_due()
+        return result
 
-    def get_all_records(self):
+    def _start_flush_timer(self):
         """
-        Retrieves all records from the worksheet.
+        Flushes the queue in a background thread when the first queued
+        write becomes due, even if nothing else is queued or read.
+        """
+        _writing_managers.add(self)
+        timer = threading.Timer(self.write_max_age, self.flush_if_due)
+        timer.daemon = True
+        timer.start()
+
+    def flush_if_due(self):
+        """
+        Flushes the queue if it is full or its oldest write is too old.
 
         Returns:
-            list: A list of dictionaries containing all records.
+            list: A list of the flushed WriteResult objects.
         """
-        return self.sheet.get_all_records()
+        with self._lock:
+            if not self._pending_writes:
+                return []
+            age = time.monotonic() - self._pending_writes[0].queued_at
+            if (
+                len(self._pending_writes) >= self.write_batch_size or
+                age >= self.write_max_age
+            ):
+                return self.flush()
+            return []
 
-    def update_row(self, row, values_list):
+    def flush(self):
         """
-        Updates a row in the worksheet.
+        Sends all queued writes to the worksheet.
+
+        Updates are sent as one batch_update call and appends as one
+        append_rows call. If a batch of updates fails, its updates are sent
+        one by one so that every write gets its own result. Appends are
+        sent again only if the batch was rejected. Every write gets
+        a result, errors are stored in it and not raised.
+
+        Returns:
+            list: A list of the flushed WriteResult objects.
+        """
+        with self._lock:
+            pending = self._pending_writes
+            self._pending_writes = []
+            if not pending:
+                return pending
+            updates = [
+                result for result in pending if result.kind == "update"
+            ]
+            appends = [
+                result for result in pending if result.kind == "append"
+            ]
+            try:
+                write_calls = 0
+                if updates:
+                    write_calls += self._flush_updates(updates)
+                if appends:
+                    write_calls += self._flush_appends(appends)
+            except Exception as e:
+                for result in pending:
+                    if not result.done:
+                        result.set_result(False, e)
+                # The cache may not match the worksheet any more
+                self.invalidate()
+                return pending
+            if any(result.success for result in pending):
+                self._write_count += 1
+                if all(result.success for result in pending):
+                    self._adopt_revision(write_calls)
+                else:
+                    self._forget_revision()
+            return pending
+
+    def _adopt_revision(self, write_calls):
+        """
+        Updates the revision of the cache after its own writes.
+
+        The cache already contains the written rows. Every write call
+        raises the version of the spreadsheet by one, so if the version grew
+        by exactly the number of calls, nobody else changed the sheet and
+        the cache stays current. Otherwise, or if the revision cannot be
+        read, the next read reloads the worksheet.
 
         Args:
-            row (int): The row number of the cell.
-            values_list (list): The list of values to set in the cells.
+            write_calls (int): The number of write calls which were sent.
+        """
+        if self._records is None or self._revision is None:
+            return
+        try:
+            revision = self.get_revision()
+        except Exception:
+            # The writes are done, the revision is just unknown
+            revision = None
+        if revision is not None and self._follows_revision(
+            revision,
+            self._revision,
+            write_calls
+        ):
+            # The snapshot is saved only after downloads, not after writes
+            self._revision = revision
+            return
+        self._forget_revision()
+
+    @staticmethod
+    def _follows_revision(revision, previous, write_calls):
+        """
+        Checks whether only the own writes changed the spreadsheet.
+
+        Args:
+            revision (tuple): The revision read after the writes.
+            previous (tuple): The revision of the cache.
+            write_calls (int): The number of write calls which were sent.
 
         Returns:
-            bool: True if the row was updated successfully, False otherwise.
+            bool: True if the version grew by the number of the calls.
         """
         try:
-            self.sheet.update(
-                range_name=f"A{row}:Z{row}",
-                values=[values_list]
-                              )
-            print(Fore.GREEN + "Row updated successfully.")
-            return True
-        except Exception as e:
-            print(Fore.RED + f"Failed to update row: {e}")
+            return int(revision[1]) == int(previous[1]) + write_calls
+        except (IndexError, TypeError, ValueError):
             return False
 
-    def append_row(self, values):
+    def _forget_revision(self):
+        """Makes the next read reload the whole worksheet."""
+        self._revision = None
+        self.expire()
+
+    def _flush_updates(self, updates):
         """
-        Appends a new row to the worksheet.
+        Sends the queued updates as one batch_update call.
 
         Args:
-            values (list): A list of values to append as a new row.
+            updates (list): A list of WriteResult objects.
 
         Returns:
-            bool: True if the row was appended successfully, False otherwise.
+            int: The number of write calls which succeeded.
         """
+        data = []
+        for result in updates:
+            data.extend(self._get_update_ranges(result))
         try:
-            self.sheet.append_row(values)
-            print(Fore.GREEN + "Row appended successfully.")
-            return True
-        except gspread.exceptions.APIError as e:
-            print(Fore.RED + f"Failed to append row: {e}")
-            return False
+            self.sheet.batch_update(data)
+        except Exception as e:
+            if len(updates) == 1:
+                updates[0].set_result(False, e)
+                return 0
+            # Find out which of the updates failed
+            return sum(self._flush_updates([result]) for result in updates)
+
+        for result in updates:
+            if result.cells is None:
+                self._cache_update(result.row, result.values)
+            else:
+                self._cache_update_cells(result.row, result.cells)
+            result.set_result(True)
+        return 1
+
+    @staticmethod
+    def _get_update_ranges(result):
+        """
+        Builds the ranges of the batch_update request of an update.
+
+        A whole row is written from column A to its last value. Changed
+        cells next to each other are written as one range.
+
+        Args:
+            result (WriteResult): The queued update.
+
+        Returns:
+            list: Dictionaries with "range" and "values".
+        """
+        row = result.row
+        if result.cells is None:
+            last_column = column_letter(max(len(result.values), 1))
+            return [{
+                "range": f"A{row}:{last_column}{row}",
+                "values": [result.values],
+            }]
+        runs = []
+        for column in sorted(result.cells):
+            if runs and runs[-1][1] == column - 1:
+                runs[-1][1] = column
+            else:
+                runs.append([column, column])
+        return [
+            {
+                "range": (
+                    f"{column_letter(first)}{row}:"
+                    f"{column_letter(last)}{row}"
+                ),
+                "values": [[
+                    result.cells[column]
+                    for column in range(first, last + 1)
+                ]],
+            }
+            for first, last in runs
+        ]
+
+    def _cache_update_cells(self, row, cells):
+        """
+        Writes updated cells through to the cache.
+
+        The cells are applied to the current cached record, so updates of
+        the same row queued earlier are kept.
+
+        Args:
+            row (int): The row number of the worksheet.
+            cells (dict): The new values by their column numbers.
+        """
+        if self._records is None:
+            return
+        index = row - 2
+        if not 0 <= index < len(self._records):
+            # The row is not known to the cache, reload it on the next read
+            self.invalidate()
+            return
+        record = self._records[index]
+        self._cache_update(row, [
+            cells.get(i, record.get(header, ""))
+            for i, header in enumerate(self._headers, start=1)
+        ])
+
+    def _flush_appends(self, appends):
+        """
+        Sends the queued appends as one append_rows call.
+
+        The rows are sent again one by one only if the batch was rejected
+        with a 4xx error, which proves that nothing was written. After
+        a server error or a timeout the rows may have been written, so all
+        appends are reported as failed and the cache is reloaded.
+
+        Args:
+            appends (list): A list of WriteResult objects.
+
+        Returns:
+            int: The number of write calls which succeeded.
+        """
+        try:
+            response = self.sheet.append_rows(
+                [result.values for result in appends]
+            )
+        except Exception as e:
+            status_code = QuotaScheduler.get_status_code(e)
+            rejected = (
+                status_code is not None and 400 <= status_code < 500
+                and status_code != 429
+            )
+            if rejected and len(appends) > 1:
+                # Find out which of the appends failed
+                return sum(
+                    self._flush_appends([result]) for result in appends
+                )
+            for result in appends:
+                result.set_result(False, e)
+            if not rejected:
+                # The rows may be in the worksheet, read it again
+                self.invalidate()
+            return 0
+
+        start_row = self._get_appended_start_row(response)
+        for offset, result in enumerate(appends):
+            row = None if start_row is None else start_row + offset
+            self._cache_append(result.values, row)
+            result.set_result(True, row=row)
+        return 1
+
+    @staticmethod
+    def _get_appended_start_row(response):
+        """
+        Reads the first appended row number from the append response.
+
+        Args:
+            response (dict): The response of the values append request.
+
+        Returns:
+            int or None: The row number or None if it is not reported.
+        """
+        try:
+            updated_range = response["updates"]["updatedRange"]
+        except (KeyError, TypeError):
+            return None
+        match = re.search(r"![A-Z]+(\d+)", updated_range)
+        return int(match.group(1)) if match else None
 
     def find_cells_contain_value(self, attributes_any, attributes_all):
         """
         Finds all cells that match a specific value in the worksheet.
 
+        Columns which have a hash index have to be equal to the value, other
+        columns have to contain the value. The indexes narrow the records
+        which are checked, so only the columns without any index or
+        the patterns shorter than three characters lead to a full scan.
+
         Args:
             attributes_any (dict): A dictionary where the key is an attribute
             and the value is the value being tested. To match though one of
@@ -152,26 +1598,187 @@ class GoogleSheet:
         Returns:
             list: A list of gspread.models.Cell objects that match the value.
         """
-        records = self.sheet.get_all_records()
-        matching_records = []
-        for row, record in enumerate(records, start=2):
-            if (not attributes_any or any(
-                value.lower() in record.get(attr).lower()
+        with self._lock:
+            records = self.get_all_records()
+            candidate_rows = self._find_candidate_rows(
+                attributes_any,
+                attributes_all
+            )
+            if candidate_rows is None:
+                # No index can narrow the search, check every record
+                rows = range(2, len(records) + 2)
+            else:
+                rows = sorted(candidate_rows)
+
+            # The columns are compared directly, the records are created
+            # only for the matching rows
+            tests_any = [
+                self._value_matcher(records, attr, value)
                 for attr, value in attributes_any.items()
-            )) and all(
-                value.lower() in record.get(attr).lower()
+            ]
+            tests_all = [
+                self._value_matcher(records, attr, value)
                 for attr, value in attributes_all.items()
-            ):
-                """
-                Check if the record matches any of the attributes
-                in attributes_any
-                Check if the record matches all of the attributes
-                in attributes_all
-                If both conditions are met, append the record
-                to matching_records
-                """
-                matching_records.append([row, record])
-        return matching_records
+            ]
+            matching_records = []
+            for row in rows:
+                index = row - 2
+                if (not tests_any or any(
+                    test(index) for test in tests_any
+                )) and all(test(index) for test in tests_all):
+                    """
+                    Check if the record matches any of the attributes
+                    in attributes_any
+                    Check if the record matches all of the attributes
+                    in attributes_all
+                    If both conditions are met, append the record
+                    to matching_records
+                    """
+                    matching_records.append([row, records[index]])
+            return matching_records
+
+    def find_similar_cells(
+        self,
+        attributes_any,
+        attributes_all,
+        limit=10,
+        time_budget=0.2
+    ):
+        """
+        Finds the records with values similar to the searched values.
+
+        Only the columns of attributes_any which have a BK-tree are
+        searched, so misspelled words are found. The records are ranked by
+        the number of typos, the closest first. The columns of
+        attributes_all have to match like in find_cells_contain_value.
+
+        Args:
+            attributes_any (dict): A dictionary where the key is an attribute
+            and the value is the value being tested. To match one of them
+            has to be similar.
+            attributes_all (dict): A dictionary where the key is an attribute
+            and the value is the value being tested. To match all of them
+            have to be equal.
+            limit (int): The largest number of returned records.
+            time_budget (float): The number of seconds after which
+            the search of the trees stops and the records found so far are
+            returned. Building a tree on the first search is not counted.
+
+        Returns:
+            list: A list of [row, record] lists, the closest first.
+        """
+        with self._lock:
+            records = self.get_all_records()
+            searched = []
+            for attr, value in attributes_any.items():
+                index = self.fuzzy_indexes.get(attr)
+                if index is None:
+                    continue
+                if not index.is_built():
+                    index.build(records.column(attr) or [])
+                searched.append((index, value))
+
+            distances = {}
+            deadline = time.monotonic() + time_budget
+            for index, value in searched:
+                for row, distance in index.search(value, deadline).items():
+                    if distance < distances.get(row, distance + 1):
+                        distances[row] = distance
+
+            tests_all = [
+                self._value_matcher(records, attr, value)
+                for attr, value in attributes_all.items()
+            ]
+            ranked = sorted(distances, key=lambda row: (distances[row], row))
+            matching_records = []
+            for row in ranked:
+                if all(test(row - 2) for test in tests_all):
+                    matching_records.append([row, records[row - 2]])
+                    if len(matching_records) == limit:
+                        break
+            return matching_records
+
+    def _value_matcher(self, records, attr, value):
+        """
+        Creates a test whether a row matches the searched value.
+
+        Args:
+            records (ColumnarRecords): The cached records.
+            attr (str): The header of the column.
+            value (str): The value being tested.
+
+        Returns:
+            callable: A function of the position of the row which returns
+            True if the column is equal to the value for the columns with
+            a hash index or contains the value for other columns.
+        """
+        column = records.column(attr)
+        if column is None:
+            column = [None] * len(records)
+        index = self.indexes.get(attr)
+        if index is not None:
+            normalize = index.normalize
+            expected = normalize(value)
+            return lambda i: normalize(column[i]) == expected
+        pattern = str(value).lower()
+        return lambda i: pattern in str(column[i]).lower()
+
+    def _index_candidates(self, attr, value):
+        """
+        Finds the rows which can match the value by the index of the column.
+
+        Args:
+            attr (str): The header of the column.
+            value (str): The value being tested.
+
+        Returns:
+            set or None: The row numbers or None if the column cannot be
+            narrowed by an index.
+        """
+        if attr in self.indexes:
+            return set(self.indexes[attr].get(value))
+        if attr in self.substring_indexes:
+            return self.substring_indexes[attr].candidates(value)
+        return None
+
+    def _find_candidate_rows(self, attributes_any, attributes_all):
+        """
+        Narrows the rows to check by the indexes.
+
+        Args:
+            attributes_any (dict): The attributes one of which has to match.
+            attributes_all (dict): The attributes all of which have to match.
+
+        Returns:
+            set or None: The row numbers which can match or None if the
+            indexes cannot narrow the search.
+        """
+        candidate_rows = None
+        for attr, value in attributes_all.items():
+            rows = self._index_candidates(attr, value)
+            if rows is None:
+                continue
+            if candidate_rows is None:
+                candidate_rows = rows
+            else:
+                candidate_rows &= rows
+
+        if attributes_any:
+            any_rows = set()
+            for attr, value in attributes_any.items():
+                rows = self._index_candidates(attr, value)
+                if rows is None:
+                    # One of the columns has to be scanned completely
+                    any_rows = None
+                    break
+                any_rows |= rows
+            if any_rows is not None:
+                if candidate_rows is None:
+                    candidate_rows = any_rows
+                else:
+                    candidate_rows &= any_rows
+
+        return candidate_rows
 
     def find_item(
         self,
@@ -183,6 +1790,9 @@ class GoogleSheet:
         """
         Find an item by values that have to be equal.
 
+        If nothing is found, the items with similar values are offered
+        instead.
+
         Args:
             attributes_any (dict): A dictionary where the key is an attribute
             and the value is the value being tested. To match though one of
@@ -205,12 +1815,27 @@ class GoogleSheet:
 
         cells = self.find_cells_contain_value(attributes_any, attributes_all)
 
-        # If no cells were found, print an error message and return None and -1
         if not cells:
-            print(Fore.RED + f"The {text_item} is not found.\n")
-            return None, -1
-
-        if len(cells) == 1:
+            # Look for values with typos before giving up
+            cells = self.find_similar_cells(attributes_any, attributes_all)
+            index = None
+            if cells:
+                print(
+                    Fore.YELLOW +
+                    f"The {text_item} is not found, similar ones are:"
+                )
+                index = self.choose_item(
+                    cells,
+                    text_item,
+                    print_item_lambda,
+                    cancel_text="None of them"
+                )
+            # If nothing was found or chosen, print an error message and
+            # return None and -1
+            if index is None:
+                print(Fore.RED + f"The {text_item} is not found.\n")
+                return None, -1
+        elif len(cells) == 1:
             # If only one cell was found, set the index to 0
             index = 0
         else:
@@ -223,10 +1848,21 @@ class GoogleSheet:
             cells[index][0],
         )
 
-    def choose_item(self, cells, text_item, print_item_lambda):
+    def choose_item(
+        self,
+        cells,
+        text_item,
+        print_item_lambda,
+        cancel_text=None
+    ):
         """
         Prompts the user to choose an item from multiple matches.
 
+        The matches are shown CHOOSE_PAGE_SIZE at a time and only
+        the shown ones are formatted, so any number of matches gives
+        a short menu. The user can move between the pages and narrow
+        the matches by a word.
+
         Args:
             cells (list): List of matched cells.
             text_item (str): String of the name of the item to print to
@@ -236,37 +1872,124 @@ class GoogleSheet:
                 The function has to have two arguments:
                 i (integer) - The row number where the item was found.
                 values_row (dict) - The item which contains details.
+            cancel_text (str or None): The text of the last option which
+            chooses none of the items. None shows no such option.
 
         Returns:
             int: The index of the chosen item.
+            or
+            None: If the user chose none of the items.
         """
+        from simple_term_menu import TerminalMenu
+
+        # The indexes of the cells which pass the narrowing words
+        matches = range(len(cells))
+        start = 0
         while True:
-            options = []
-            for i, cell in enumerate(cells, start=1):
-                values_row = cell[1]
-                options.append(print_item_lambda(i, values_row))
+            stop = min(start + self.CHOOSE_PAGE_SIZE, len(matches))
+            options = [
+                print_item_lambda(index + 1, cells[index][1])
+                for index in matches[start:stop]
+            ]
+            # The options after the items and what they do
+            actions = []
+            if stop < len(matches):
+                actions.append(("Next matches", "next"))
+            if start > 0:
+                actions.append(("Previous matches", "previous"))
+            if len(matches) > 1:
+                actions.append(("Narrow the matches by a word", "narrow"))
+            if len(matches) < len(cells):
+                actions.append(("Show all matches", "all"))
+            if cancel_text is not None:
+                actions.append((cancel_text, "cancel"))
 
+            title = (
+                f"Choose the {text_item} "
+                f"({start + 1}-{stop} of {len(matches)} matches"
+            )
+            if stop < len(matches):
+                title += f", {len(matches) - stop} more matches"
             terminal_menu = TerminalMenu(
-                options,
-                title=f"Choose the {text_item}"
+                options + [text for text, _ in actions],
+                title=title + ")"
             )
             choice = terminal_menu.show()
 
-            try:
-                # Check if the chosen option is valid
-                if 0 <= choice < len(cells):
-                    # Return the chosen option's index
-                    return choice
-                # Raise an error if the choice is not valid
-                raise ValueError(Fore.RED + "Please enter a valid option.")
-            except ValueError as e:
+            if choice is None:
+                # The escape key works like the cancel option
+                action = "cancel" if cancel_text is not None else None
+            elif choice < len(options):
+                # Return the chosen item's index
+                return matches[start + choice]
+            else:
+                action = actions[choice - len(options)][1]
+
+            if action == "next":
+                start = stop
+            elif action == "previous":
+                start = max(start - self.CHOOSE_PAGE_SIZE, 0)
+            elif action == "narrow":
+                narrowed = self._narrow_choices(
+                    cells,
+                    matches,
+                    text_item,
+                    print_item_lambda
+                )
+                if narrowed is not None:
+                    matches, start = narrowed, 0
+            elif action == "all":
+                matches, start = range(len(cells)), 0
+            elif action == "cancel":
+                return None
+            else:
                 # Print the error message and prompt the user to try again
-                print(Fore.RED + f"Invalid data: {e}, please try again.\n")
+                print(
+                    Fore.RED +
+                    "Invalid data: Please enter a valid option, please try "
+                    "again.\n"
+                )
+
+    @staticmethod
+    def _narrow_choices(cells, matches, text_item, print_item_lambda):
+        """
+        Asks for a word and keeps the matches which contain it.
+
+        Args:
+            cells (list): List of matched cells.
+            matches (sequence): The indexes of the shown cells.
+            text_item (str): String of the name of the item to print to
+            the user.
+            print_item_lambda (lambda): Lambda function which prints
+            the detailed information of the item.
+
+        Returns:
+            list or None: The indexes of the cells whose text contains
+            the word or None if the user entered "exit" or nothing matched.
+        """
+        word = InputMixin.input_str(
+            "Enter a word to narrow the matches or 'exit' to go back:\n"
+        )
+        if word is None:
+            return None
+        word = word.lower()
+        narrowed = [
+            index for index in matches
+            if word in print_item_lambda(index + 1, cells[index][1]).lower()
+        ]
+        if not narrowed:
+            print(Fore.RED + f"No {text_item} contains '{word}'.\n")
+            return None
+        return narrowed
 
     def check_duplicate_data(self, attributes):
         """
         Checks the database for duplicate data by specified attributes.
 
+        If the attributes are a uniqueness key, the answer comes from its
+        index and the values are compared case-insensitively. Otherwise
+        the records are scanned for equal values.
+
         Args:
             attributes (dict): A dictionary where the key is an attribute and
             the value is the value being tested.
@@ -274,14 +1997,75 @@ class GoogleSheet:
         Returns:
             Dictionary: The record if a duplicate is found, otherwise None.
         """
-        records = self.get_all_records()
-        for record in records:
-            # Check if all specified attributes match the values in the record
-            if all(
-                record.get(attr) == value for attr,
-                value in attributes.items()
+        return self.find_duplicates([attributes])[0]
+
+    def find_duplicates(self, attributes_list):
+        """
+        Checks many candidates for duplicate data in one call.
+
+        A candidate which repeats the uniqueness key of an earlier
+        candidate is a duplicate of it, so a batch can be checked before
+        any of it is written.
+
+        Args:
+            attributes_list (list): Dictionaries like the attributes of
+            check_duplicate_data.
+
+        Returns:
+            list: For every candidate the duplicate record, the earlier
+            candidate or None.
+        """
+        with self._lock:
+            records = self.get_all_records()
+            duplicates = []
+            candidates = {}
+            for attributes in attributes_list:
+                index = self.unique_indexes.get(frozenset(attributes))
+                if index is None:
+                    duplicates.append(
+                        self._scan_duplicate(records, attributes)
+                    )
+                    continue
+                values = [
+                    attributes[attribute] for attribute in index.attributes
+                ]
+                rows = index.get(values)
+                key = (index.attributes, index.make_key(values))
+                if rows:
+                    duplicates.append(records[rows[0] - 2])
+                else:
+                    duplicates.append(candidates.get(key))
+                    candidates.setdefault(key, attributes)
+            return duplicates
+
+    @staticmethod
+    def _scan_duplicate(records, attributes):
+        """
+        Scans the records for equal values.
+
+        Args:
+            records (ColumnarRecords): The cached records.
+            attributes (dict): A dictionary where the key is an attribute and
+            the value is the value being tested.
+
+        Returns:
+            RecordView or None: The first record with the values.
+        """
+        columns = []
+        for attr, value in attributes.items():
+            column = records.column(attr)
+            columns.append(
+                ([None] * len(records) if column is None else column, value)
+            )
+        if not columns:
+            return records[0] if records else None
+        (first_column, first_value), other_columns = columns[0], columns[1:]
+        for i, cell in enumerate(first_column):
+            # Check if all specified attributes match the values in the row
+            if cell == first_value and all(
+                column[i] == value for column, value in other_columns
             ):
                 # Return the record if a duplicate is found
-                return record
+                return records[i]
         # Return None if no duplicate is found
         return None
@@ -0,0 +1,566 @@
+import bisect
+import re
+import time
+from array import array
+
+
+class HashIndex:
+    """
+    An in-memory hash index which maps the value of a column to the row
+    numbers where the value is stored.
+
+    The values are compared case-insensitively, the same way the worksheet
+    search compares them.
+
+    Attributes:
+        attribute (str): The header of the indexed column.
+        rows_by_value (dict): A dictionary where the key is the normalized
+        value and the value is the list of row numbers.
+    """
+
+    def __init__(self, attribute):
+        """
+        Initializes the HashIndex class.
+
+        Args:
+            attribute (str): The header of the indexed column.
+        """
+        self.attribute = attribute
+        self.rows_by_value = {}
+
+    @staticmethod
+    def normalize(value):
+        """
+        Converts the value to the key of the index.
+
+        Args:
+            value (str or int): The value of the cell.
+
+        Returns:
+            str: The normalized value.
+        """
+        text = str(value).strip().lower()
+        # Keep one copy of a value which is already normalized
+        return value if text == value else text
+
+    def clear(self):
+        """Removes all values from the index."""
+        self.rows_by_value = {}
+
+    def add(self, row, value):
+        """
+        Adds the row to the index.
+
+        Args:
+            row (int): The row number of the worksheet.
+            value (str or int): The value of the cell.
+        """
+        self.rows_by_value.setdefault(self.normalize(value), []).append(row)
+
+    def remove(self, row, value):
+        """
+        Removes the row from the index.
+
+        Args:
+            row (int): The row number of the worksheet.
+            value (str or int): The value of the cell.
+        """
+        key = self.normalize(value)
+        rows = self.rows_by_value.get(key)
+        if rows and row in rows:
+            rows.remove(row)
+            if not rows:
+                # Do not keep empty lists for values which are not used
+                del self.rows_by_value[key]
+
+    def get(self, value):
+        """
+        Returns the rows which contain exactly the value.
+
+        Args:
+            value (str or int): The value being looked up.
+
+        Returns:
+            list: A list of row numbers.
+        """
+        return self.rows_by_value.get(self.normalize(value), [])
+
+
+class TrigramIndex:
+    """
+    An in-memory inverted index of the trigrams of a text column.
+
+    It is used to narrow the rows before a case-insensitive substring check.
+    Every row which contains a pattern also contains all trigrams of the
+    pattern, so the rows found by the index always include the matches.
+
+    The row numbers of a trigram are kept sorted in an array of 32-bit
+    integers, which takes a fraction of the memory of a set.
+
+    Attributes:
+        attribute (str): The header of the indexed column.
+        rows_by_trigram (dict): A dictionary where the key is a trigram and
+        the value is the sorted array of row numbers.
+    """
+
+    def __init__(self, attribute):
+        """
+        Initializes the TrigramIndex class.
+
+        Args:
+            attribute (str): The header of the indexed column.
+        """
+        self.attribute = attribute
+        self.rows_by_trigram = {}
+
+    @staticmethod
+    def trigrams(value):
+        """
+        Splits the value into lowercase trigrams.
+
+        Args:
+            value (str or int): The value of the cell.
+
+        Returns:
+            set: A set of trigrams. It is empty if the value is shorter than
+            three characters.
+        """
+        text = str(value).lower()
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def clear(self):
+        """Removes all values from the index."""
+        self.rows_by_trigram = {}
+
+    def build(self, column, start=2):
+        """
+        Replaces the index with the values of a whole column.
+
+        The rows are added in order, so no array is sorted.
+
+        Args:
+            column (iterable): The values of the column in row order.
+            start (int): The row number of the first value.
+        """
+        rows_by_trigram = {}
+        for row, value in enumerate(column, start=start):
+            for trigram in self.trigrams(value):
+                rows = rows_by_trigram.get(trigram)
+                if rows is None:
+                    rows = rows_by_trigram[trigram] = array("i")
+                rows.append(row)
+        self.rows_by_trigram = rows_by_trigram
+
+    def add(self, row, value):
+        """
+        Adds the row to the index.
+
+        Args:
+            row (int): The row number of the worksheet.
+            value (str or int): The value of the cell.
+        """
+        for trigram in self.trigrams(value):
+            rows = self.rows_by_trigram.get(trigram)
+            if rows is None:
+                self.rows_by_trigram[trigram] = array("i", [row])
+            elif not rows or rows[-1] < row:
+                # Appended rows come last, so the array stays sorted
+                rows.append(row)
+            else:
+                position = bisect.bisect_left(rows, row)
+                if position == len(rows) or rows[position] != row:
+                    rows.insert(position, row)
+
+    def remove(self, row, value):
+        """
+        Removes the row from the index.
+
+        Args:
+            row (int): The row number of the worksheet.
+            value (str or int): The value of the cell.
+        """
+        for trigram in self.trigrams(value):
+            rows = self.rows_by_trigram.get(trigram)
+            if rows is None:
+                continue
+            if self._contains(rows, row):
+                del rows[bisect.bisect_left(rows, row)]
+                if not rows:
+                    del self.rows_by_trigram[trigram]
+
+    def candidates(self, pattern):
+        """
+        Returns the rows which can contain the pattern.
+
+        Args:
+            pattern (str): The part of the value being looked for.
+
+        Returns:
+            set or None: The row numbers which contain all trigrams of
+            the pattern or None if the pattern is too short to use the index.
+        """
+        trigrams = self.trigrams(pattern)
+        if not trigrams:
+            return None
+        # Start from the rarest trigram to keep the intersection small
+        row_arrays = sorted(
+            (
+                self.rows_by_trigram.get(trigram, ())
+                for trigram in trigrams
+            ),
+            key=len
+        )
+        rows = set(row_arrays[0])
+        for row_array in row_arrays[1:]:
+            if not rows:
+                break
+            if len(rows) * 8 < len(row_array):
+                # Look the few rows up instead of reading the whole array
+                rows = {row for row in rows if self._contains(row_array, row)}
+            else:
+                rows.intersection_update(row_array)
+        return rows
+
+    @staticmethod
+    def _contains(rows, row):
+        """
+        Checks whether a sorted array holds the row number.
+
+        Args:
+            rows (array): The sorted row numbers.
+            row (int): The row number.
+
+        Returns:
+            bool: True if the row is in the array.
+        """
+        position = bisect.bisect_left(rows, row)
+        return position < len(rows) and rows[position] == row
+
+
+class KeyIndex:
+    """
+    An in-memory hash index of a uniqueness key made of several columns.
+
+    It maps the values of the columns of a row to the row numbers, so
+    a duplicate is found without scanning the records. The values are
+    compared case-insensitively like in HashIndex.
+
+    Attributes:
+        attributes (tuple): The headers of the columns of the key.
+        rows_by_key (dict): A dictionary where the key is the tuple of
+        normalized values and the value is the list of row numbers.
+    """
+
+    def __init__(self, attributes):
+        """
+        Initializes the KeyIndex class.
+
+        Args:
+            attributes (iterable): The headers of the columns of the key.
+        """
+        self.attributes = tuple(attributes)
+        self.rows_by_key = {}
+
+    @staticmethod
+    def make_key(values):
+        """
+        Converts the values of the columns to the key of the index.
+
+        Args:
+            values (iterable): The values in the order of the attributes.
+
+        Returns:
+            tuple: The normalized values.
+        """
+        return tuple(HashIndex.normalize(value) for value in values)
+
+    def clear(self):
+        """Removes all keys from the index."""
+        self.rows_by_key = {}
+
+    def add(self, row, values):
+        """
+        Adds the row to the index.
+
+        Args:
+            row (int): The row number of the worksheet.
+            values (iterable): The values in the order of the attributes.
+        """
+        self.rows_by_key.setdefault(self.make_key(values), []).append(row)
+
+    def remove(self, row, values):
+        """
+        Removes the row from the index.
+
+        Args:
+            row (int): The row number of the worksheet.
+            values (iterable): The values in the order of the attributes.
+        """
+        key = self.make_key(values)
+        rows = self.rows_by_key.get(key)
+        if rows and row in rows:
+            rows.remove(row)
+            if not rows:
+                # Do not keep empty lists for keys which are not used
+                del self.rows_by_key[key]
+
+    def get(self, values):
+        """
+        Returns the rows which have the key.
+
+        Args:
+            values (iterable): The values in the order of the attributes.
+
+        Returns:
+            list: A list of row numbers.
+        """
+        return self.rows_by_key.get(self.make_key(values), [])
+
+
+class BKTree:
+    """
+    An in-memory BK-tree of the words of a text column.
+
+    The tree finds the words within an edit distance of a searched word
+    without comparing it to every word, so misspelled names and titles can
+    be found. It is built from the column on the first search and then
+    follows the added records. The words of removed records stay in
+    the tree, but they are skipped because no row has them any more.
+
+    Attributes:
+        attribute (str): The header of the indexed column.
+        rows_by_word (dict or None): A dictionary where the key is
+        a lowercase word and the value is the set of row numbers. None
+        until the tree is built.
+    """
+
+    # Shorter words are not indexed and not searched
+    MIN_WORD_LENGTH = 3
+
+    def __init__(self, attribute):
+        """
+        Initializes the BKTree class.
+
+        Args:
+            attribute (str): The header of the indexed column.
+        """
+        self.attribute = attribute
+        self.rows_by_word = None
+        # Every node is a list of the word and a dictionary where the key
+        # is the distance and the value is the child node
+        self._root = None
+
+    @classmethod
+    def words(cls, value):
+        """
+        Splits the value into lowercase words.
+
+        Args:
+            value (str or int): The value of the cell.
+
+        Returns:
+            list: The words which are long enough to be indexed.
+        """
+        return [
+            word for word in re.findall(r"\w+", str(value).lower())
+            if len(word) >= cls.MIN_WORD_LENGTH
+        ]
+
+    @staticmethod
+    def distance(first, second):
+        """
+        Computes the Levenshtein distance of two words.
+
+        Args:
+            first (str): The first word.
+            second (str): The second word.
+
+        Returns:
+            int: The number of inserted, deleted or replaced characters
+            which turn one word into the other.
+        """
+        if first == second:
+            return 0
+        if len(first) < len(second):
+            first, second = second, first
+        previous = list(range(len(second) + 1))
+        for i, char in enumerate(first, start=1):
+            current = [i]
+            for j, other in enumerate(second, start=1):
+                current.append(min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char != other)
+                ))
+            previous = current
+        return previous[-1]
+
+    @classmethod
+    def max_distance(cls, word):
+        """
+        Returns the number of typos allowed in a searched word.
+
+        Args:
+            word (str): The searched word.
+
+        Returns:
+            int: 1 for words up to five characters, otherwise 2.
+        """
+        return 1 if len(word) <= 5 else 2
+
+    def is_built(self):
+        """
+        Checks whether the tree is built.
+
+        Returns:
+            bool: True if the tree can be searched.
+        """
+        return self.rows_by_word is not None
+
+    def build(self, column):
+        """
+        Builds the tree from the values of the column.
+
+        Args:
+            column (iterable): The values in row order, the first value is
+            in row 2.
+        """
+        self.rows_by_word = {}
+        self._root = None
+        for row, value in enumerate(column, start=2):
+            self.add(row, value)
+
+    def clear(self):
+        """Drops the tree, it is built again on the next search."""
+        self.rows_by_word = None
+        self._root = None
+
+    def _insert(self, word):
+        """
+        Inserts a word into the tree.
+
+        Args:
+            word (str): The lowercase word.
+        """
+        if self._root is None:
+            self._root = [word, {}]
+            return
+        node = self._root
+        while True:
+            distance = self.distance(word, node[0])
+            if distance == 0:
+                # The word of a removed record is used again
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = [word, {}]
+                return
+            node = child
+
+    def add(self, row, value):
+        """
+        Adds the row to the tree if the tree is built.
+
+        Args:
+            row (int): The row number of the worksheet.
+            value (str or int): The value of the cell.
+        """
+        if self.rows_by_word is None:
+            return
+        for word in self.words(value):
+            rows = self.rows_by_word.get(word)
+            if rows is None:
+                rows = self.rows_by_word[word] = set()
+                self._insert(word)
+            rows.add(row)
+
+    def remove(self, row, value):
+        """
+        Removes the row from the tree if the tree is built.
+
+        Args:
+            row (int): The row number of the worksheet.
+            value (str or int): The value of the cell.
+        """
+        if self.rows_by_word is None:
+            return
+        for word in self.words(value):
+            rows = self.rows_by_word.get(word)
+            if rows is not None:
+                rows.discard(row)
+                if not rows:
+                    # The node stays in the tree, searches skip the word
+                    del self.rows_by_word[word]
+
+    def find_words(self, word, max_distance, deadline=None):
+        """
+        Finds the indexed words close to a word.
+
+        Args:
+            word (str): The lowercase searched word.
+            max_distance (int): The largest allowed distance.
+            deadline (float or None): The time.monotonic() value after
+            which the search stops and returns the words found so far.
+
+        Returns:
+            dict: A dictionary where the key is a found word and the value
+            is its distance from the searched word.
+        """
+        found = {}
+        nodes = [self._root] if self._root is not None else []
+        while nodes:
+            if deadline is not None and time.monotonic() > deadline:
+                break
+            node_word, children = nodes.pop()
+            distance = self.distance(word, node_word)
+            if distance <= max_distance and node_word in self.rows_by_word:
+                found[node_word] = distance
+            # By the triangle inequality only these children can be close
+            for child_distance in range(
+                max(1, distance - max_distance),
+                distance + max_distance + 1
+            ):
+                child = children.get(child_distance)
+                if child is not None:
+                    nodes.append(child)
+        return found
+
+    def search(self, pattern, deadline=None):
+        """
+        Finds the rows whose value contains words similar to the pattern.
+
+        Every word of the pattern has to be close to a word of the row.
+        Words shorter than MIN_WORD_LENGTH are ignored.
+
+        Args:
+            pattern (str): The searched value.
+            deadline (float or None): The time.monotonic() value after
+            which the search stops and returns the rows found so far.
+
+        Returns:
+            dict: A dictionary where the key is the row number and
+            the value is the sum of the distances of the words. It is empty
+            if the pattern has no word long enough.
+        """
+        distances = None
+        for word in self.words(pattern):
+            word_distances = {}
+            for found, distance in self.find_words(
+                word,
+                self.max_distance(word),
+                deadline
+            ).items():
+                for row in self.rows_by_word[found]:
+                    if distance < word_distances.get(row, distance + 1):
+                        word_distances[row] = distance
+            if distances is None:
+                distances = word_distances
+            else:
+                distances = {
+                    row: distances[row] + distance
+                    for row, distance in word_distances.items()
+                    if row in distances
+                }
+            if not distances:
+                break
+        return distances or {}
@@ -1,9 +1,9 @@
 import os
 from colorama import Fore
-from tabulate import tabulate
-from simple_term_menu import TerminalMenu
 from authors import Author, Authors
 from books import Book, Books
+from catalog_view import BooksWithAuthorsView
+from table_pager import TablePager
 from mixin_classes import UniqueIDMixin, InputMixin
 
 
@@ -13,6 +13,9 @@ class Menu(InputMixin):
 
     Attributes:
         authors_manager (Authors): An instance of the Authors class.
+        books_manager (Books): An instance of the Books class.
+        catalog (BooksWithAuthorsView): The books joined with the full
+        names of their authors.
     """
 
     def __init__(self, authors_manager, books_manager):
@@ -25,9 +28,13 @@ class Menu(InputMixin):
         """
         self.authors_manager = authors_manager
         self.books_manager = books_manager
+        self.catalog = BooksWithAuthorsView(books_manager, authors_manager)
 
     def display_menu(self):
         """Displays the main menu and handles user input."""
+        # Imported on first use to start the menu faster
+        from simple_term_menu import TerminalMenu
+
         while True:
             options = ["1. Authors", "2. Books", "3. Exit"]
             terminal_menu = TerminalMenu(options, title="\nMain Menu")
@@ -52,6 +59,8 @@ class Menu(InputMixin):
     # Authors menu
     def display_authors_menu(self):
         """Displays the 'authors' menu and handles user input."""
+        from simple_term_menu import TerminalMenu
+
         while True:
             options = [
                 "1. Get all authors",
@@ -87,14 +96,38 @@ class Menu(InputMixin):
                     "Invalid choice. Please enter a valid option."
                 )
 
+    @staticmethod
+    def show_columns(headers, columns):
+        """
+        Prints a table given by columns page by page.
+
+        Only the rows of the shown page are formatted.
+
+        Args:
+            headers (list): The headers of the columns.
+            columns (list): The sequences of values, one for every header.
+        """
+        TablePager(headers, columns).show()
+
+    def load_catalog(self):
+        """Loads the books and the authors at the same time."""
+        # asyncio is imported on first use to start the menu faster
+        from async_googlesheets import load_records
+
+        load_records(self.books_manager, self.authors_manager)
+
     def get_all_authors(self):
         """Displays all authors."""
-        authors = self.authors_manager.get_all_authors()
-        table = [self.authors_manager.get_headers_for_table()]
-        for author in authors:
-            table.append(author.to_list())
-
-        print(Fore.YELLOW + tabulate(table))
+        # Page the cached columns instead of creating the authors
+        names = self.authors_manager.attributes_name
+        self.show_columns(
+            self.authors_manager.get_headers_for_table(),
+            [
+                self.authors_manager.get_column(names["id"]),
+                self.authors_manager.get_column(names["full_name"]),
+                self.authors_manager.get_column(names["birth_year"]),
+            ]
+        )
 
     def add_new_author(self):
         """Adds a new author."""
@@ -217,26 +250,20 @@ class Menu(InputMixin):
             return
 
         # Get all books by the author's ID
-        books = self.books_manager.get_all_books_with_selection(
-            {},
-            {
-                self.books_manager.attributes_name["author_id"]: author.id,
-            }
-        )
-        # Create a table header
-        table = [self.books_manager.get_headers_for_table()]
+        books = self.books_manager.get_books_by_author(author.id)
 
         if books:
-            # If books are found, append each book's details to the table
-            for book in books:
-                table.append([
-                    book.id,
-                    book.title,
-                    author.full_name,
-                    book.shelf_number
-                ])
-            # Print the table with book details in yellow color
-            print(Fore.YELLOW + tabulate(table))
+            # If books are found, print them with the author's name
+            # in yellow color
+            self.show_columns(
+                self.books_manager.get_headers_for_table(),
+                [
+                    [book.id for book in books],
+                    [book.title for book in books],
+                    [author.full_name] * len(books),
+                    [book.shelf_number for book in books],
+                ]
+            )
         else:
             # If no books are found, print a message in red color
             print(Fore.RED + f"No books found by {author.full_name}")
@@ -244,6 +271,8 @@ class Menu(InputMixin):
     # Books menu
     def display_books_menu(self):
         """Displays the books menu and handles user input."""
+        from simple_term_menu import TerminalMenu
+
         while True:
             options = [
                 "1. Get all books",
@@ -279,36 +308,15 @@ class Menu(InputMixin):
                     "Invalid choice. Please enter a valid option."
                 )
 
-    def print_books(self, books):
-        """
-        Print all books.
-
-        Args:
-            books (list): The lust of Book objects to print.
-
-        """
-        authors = self.authors_manager.get_all_authors_dictionary()
-        table = [self.books_manager.get_headers_for_table()]
-
-        for book in books:
-            try:
-                author_full_name = authors[book.author_id]
-            except KeyError as e:
-                author_full_name = "Invalid author's ID"
-            finally:
-                table.append([
-                    book.id,
-                    book.title,
-                    author_full_name,
-                    book.shelf_number
-                ])
-
-        print(Fore.YELLOW + tabulate(table))
-
     def get_all_books(self):
         """Displays all books."""
-        books = self.books_manager.get_all_books()
-        self.print_books(books)
+        # Fetch the books and the authors at the same time
+        self.load_catalog()
+        # The catalog already has the books joined with the authors
+        self.show_columns(
+            self.books_manager.get_headers_for_table(),
+            self.catalog.get_table_columns()
+        )
 
     def get_books_by_tittle(self):
         """Gets books by a part of the title."""
@@ -322,17 +330,24 @@ class Menu(InputMixin):
             # If the title is empty, print an error message in red color
             print(Fore.RED + "The title cannot be empty.")
         else:
-            # Get all books that contain the specified title
-            books = self.books_manager.get_all_books_with_selection(
+            # Fetch the books and the authors at the same time
+            self.load_catalog()
+            # Get the rows of all books that contain the specified title
+            cells = self.books_manager.find_cells_contain_value(
                 {
                     self.books_manager.attributes_name["title"]: title
                 },
                 {}
             )
             # Check if any books were found
-            if books:
-                # If books are found, print the details of the books
-                self.print_books(books)
+            if cells:
+                # If books are found, print them from the catalog
+                self.show_columns(
+                    self.books_manager.get_headers_for_table(),
+                    self.catalog.get_table_columns(
+                        [row for row, _ in cells]
+                    )
+                )
             else:
                 # If no books are found, print a message in red color
                 print(Fore.RED + "No books found.")
@@ -499,7 +514,7 @@ class Menu(InputMixin):
 
             book.shelf_number = shelf_number
             # Edit the book in the worksheet
-            if self.books_manager.update_row(row, book.to_list()):
+            if self.books_manager.edit_book(row, book):
                 # If the book is successfully edited
                 print(
                     Fore.GREEN +
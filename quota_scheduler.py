@@ -0,0 +1,347 @@
+import random
+import threading
+import time
+from collections import deque
+
+
+# Status codes of the responses which are worth retrying
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# A write may be applied before a server error is returned, so only
+# the quota errors, which reject the request, are retried for writes
+WRITE_RETRY_STATUS_CODES = (429,)
+# Worksheet methods which use the read or the write quota
+READ_METHODS = frozenset([
+    "get", "batch_get", "get_all_records", "get_all_values", "row_values",
+    "col_values", "acell", "cell", "find", "findall",
+])
+WRITE_METHODS = frozenset([
+    "update", "batch_update", "append_row", "append_rows", "update_acell",
+    "update_cell", "update_cells", "add_rows", "delete_rows", "clear",
+])
+
+
+class TokenBucket:
+    """
+    A token bucket which limits the number of requests per minute.
+
+    Attributes:
+        rate (float): The number of tokens added per second.
+        capacity (float): The maximal number of tokens, i.e. the burst.
+        tokens (float): The number of available tokens.
+    """
+
+    def __init__(self, per_minute, capacity):
+        """
+        Initializes the TokenBucket class.
+
+        Args:
+            per_minute (float): The number of requests allowed per minute.
+            capacity (float): The number of requests which can be sent
+            at once after a quiet period.
+        """
+        self.rate = per_minute / 60
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def reserve(self):
+        """
+        Takes a token if one is available.
+
+        Returns:
+            float: 0 if a token was taken, otherwise the number of seconds
+            until the next token.
+        """
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def drain(self):
+        """Removes the available tokens after the server refused a call."""
+        self.tokens = min(self.tokens, 0)
+
+
+class QuotaScheduler:
+    """
+    Sends the API calls within the Google Sheets quotas.
+
+    Every call takes a token from the bucket of its kind ("read" or
+    "write"). When the bucket is empty, the callers wait in a queue in the
+    order they arrived instead of failing. Calls which fail with a quota
+    error (429) or a server error (5xx) are retried with jittered
+    exponential backoff.
+
+    The default limits are the Sheets API quotas per user: 60 read and 60
+    write requests per minute.
+
+    Attributes:
+        buckets (dict): The TokenBucket of every kind.
+        max_retries (int): The number of retries of one call.
+        base_backoff (float): The first backoff in seconds.
+        max_backoff (float): The longest backoff in seconds.
+    """
+
+    def __init__(
+        self,
+        reads_per_minute=60,
+        writes_per_minute=60,
+        burst=None,
+        max_retries=6,
+        base_backoff=1,
+        max_backoff=64
+    ):
+        """
+        Initializes the QuotaScheduler class.
+
+        Args:
+            reads_per_minute (float): The read requests allowed per minute.
+            writes_per_minute (float): The write requests allowed per minute.
+            burst (float or None): The requests which can be sent at once.
+            None allows the whole quota of a minute, like the Sheets API.
+            max_retries (int): The number of retries of one call.
+            base_backoff (float): The first backoff in seconds.
+            max_backoff (float): The longest backoff in seconds.
+        """
+        self.buckets = {
+            "read": TokenBucket(reads_per_minute, burst or reads_per_minute),
+            "write": TokenBucket(
+                writes_per_minute,
+                burst or writes_per_minute
+            ),
+        }
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._condition = threading.Condition()
+        self._queues = {kind: deque() for kind in self.buckets}
+        self._stats = {
+            "calls": 0,
+            "retries": 0,
+            "failures": 0,
+            "max_queue_depth": 0,
+            "total_wait": 0.0,
+            "max_wait": 0.0,
+        }
+
+    @staticmethod
+    def get_status_code(error):
+        """
+        Finds the HTTP status code of an API error.
+
+        Args:
+            error (Exception): The error raised by gspread or requests.
+
+        Returns:
+            int or None: The status code or None if there is no response.
+        """
+        response = getattr(error, "response", None)
+        return getattr(response, "status_code", None)
+
+    def acquire(self, kind):
+        """
+        Waits in the queue until a token of the kind is taken.
+
+        Args:
+            kind (str): "read" or "write".
+
+        Returns:
+            float: The seconds spent waiting.
+        """
+        bucket = self.buckets[kind]
+        queue = self._queues[kind]
+        ticket = object()
+        started_at = time.monotonic()
+        with self._condition:
+            queue.append(ticket)
+            self._stats["max_queue_depth"] = max(
+                self._stats["max_queue_depth"],
+                self.queue_depth()
+            )
+            try:
+                while True:
+                    # Only the first caller in the queue takes tokens
+                    timeout = None
+                    if queue[0] is ticket:
+                        timeout = bucket.reserve()
+                        if not timeout:
+                            break
+                    self._condition.wait(timeout)
+            finally:
+                queue.remove(ticket)
+                self._condition.notify_all()
+            waited = time.monotonic() - started_at
+            self._stats["total_wait"] += waited
+            self._stats["max_wait"] = max(self._stats["max_wait"], waited)
+        return waited
+
+    def get_backoff(self, attempt, error):
+        """
+        Calculates the pause before the next retry.
+
+        Args:
+            attempt (int): The number of the retry, starting from 0.
+            error (Exception): The error of the failed call.
+
+        Returns:
+            float: The pause in seconds.
+        """
+        delay = min(self.max_backoff, self.base_backoff * 2 ** attempt)
+        # Full jitter spreads the retries of waiting callers
+        delay = random.uniform(0, delay)
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or {}
+        try:
+            delay = max(delay, float(headers.get("Retry-After", 0)))
+        except (TypeError, ValueError):
+            pass
+        return delay
+
+    def call(self, kind, function, *args, **kwargs):
+        """
+        Runs an API call within the quota.
+
+        Args:
+            kind (str): "read" or "write".
+            function (callable): The API call.
+
+        Returns:
+            The result of the function.
+
+        Raises:
+            Exception: The error of the last attempt if the call is not
+            retryable or all retries failed.
+        """
+        with self._condition:
+            self._stats["calls"] += 1
+        if kind == "write":
+            retry_status_codes = WRITE_RETRY_STATUS_CODES
+        else:
+            retry_status_codes = RETRY_STATUS_CODES
+        attempt = 0
+        while True:
+            self.acquire(kind)
+            try:
+                return function(*args, **kwargs)
+            except Exception as e:
+                status_code = self.get_status_code(e)
+                if (
+                    status_code not in retry_status_codes
+                    or attempt >= self.max_retries
+                ):
+                    with self._condition:
+                        self._stats["failures"] += 1
+                    raise
+                if status_code == 429:
+                    # Slow down the other callers as well
+                    with self._condition:
+                        self.buckets[kind].drain()
+                with self._condition:
+                    self._stats["retries"] += 1
+                time.sleep(self.get_backoff(attempt, e))
+                attempt += 1
+
+    def queue_depth(self):
+        """
+        Returns the number of callers waiting for a token.
+
+        Returns:
+            int: The number of waiting callers.
+        """
+        return sum(len(queue) for queue in self._queues.values())
+
+    def stats(self):
+        """
+        Returns the statistics of the scheduler.
+
+        Returns:
+            dict: The number of calls, retries and failures, the current
+            and the maximal queue depth and the total, average and maximal
+            wait in seconds.
+        """
+        with self._condition:
+            stats = dict(self._stats)
+            stats["queue_depth"] = self.queue_depth()
+        stats["average_wait"] = (
+            stats["total_wait"] / stats["calls"] if stats["calls"] else 0.0
+        )
+        return stats
+
+
+class ScheduledWorksheet:
+    """
+    A worksheet whose API calls go through a QuotaScheduler.
+
+    The read and write methods are run by the scheduler. Other attributes
+    are taken from the worksheet.
+
+    Attributes:
+        sheet (gspread.models.Worksheet): The worksheet object.
+        scheduler (QuotaScheduler): The scheduler of the client.
+    """
+
+    def __init__(self, sheet, scheduler):
+        """
+        Initializes the ScheduledWorksheet class.
+
+        Args:
+            sheet (gspread.models.Worksheet): The worksheet object.
+            scheduler (QuotaScheduler): The scheduler of the client.
+        """
+        self.sheet = sheet
+        self.scheduler = scheduler
+
+    def __getattr__(self, name):
+        """
+        Returns the attribute of the worksheet, API methods are scheduled.
+
+        Args:
+            name (str): The name of the attribute.
+
+        Returns:
+            The attribute of the worksheet.
+        """
+        attribute = getattr(self.sheet, name)
+        if name in READ_METHODS:
+            kind = "read"
+        elif name in WRITE_METHODS:
+            kind = "write"
+        else:
+            return attribute
+
+        def scheduled(*args, **kwargs):
+            return self.scheduler.call(kind, attribute, *args, **kwargs)
+
+        return scheduled
+
+    def get_revision(self):
+        """
+        Reads the revision of the spreadsheet from the Drive API.
+
+        No values are downloaded, so it is a cheap way to find out whether
+        the spreadsheet was changed.
+
+        Returns:
+            tuple: (modifiedTime, version) of the spreadsheet file.
+        """
+        from gspread.urls import DRIVE_FILES_API_V3_URL
+
+        spreadsheet = self.sheet.spreadsheet
+        response = self.scheduler.call(
+            "read",
+            spreadsheet.client.request,
+            "get",
+            f"{DRIVE_FILES_API_V3_URL}/{spreadsheet.id}",
+            params={
+                "fields": "modifiedTime,version",
+                "supportsAllDrives": True,
+            }
+        )
+        metadata = response.json()
+        return metadata.get("modifiedTime"), metadata.get("version")
@@ -0,0 +1,324 @@
+import sys
+from array import array
+from collections.abc import Mapping
+
+
+# The ASCII characters which may start the text of a number, including
+# "inf" and "nan". Other characters may be Unicode digits or spaces.
+NUMERIC_START = frozenset("+-.,0123456789 \t\n\r\x0b\x0ciInN")
+
+
+def numericise_column(values):
+    """
+    Converts the text of a column to numbers like gspread does.
+
+    Every distinct value is converted once and values which cannot be
+    numbers are kept without trying to convert them.
+
+    Args:
+        values (list): The values of the column as text.
+
+    Returns:
+        list: The values, numbers are int or float.
+    """
+    # gspread is imported on first use to start the menu faster
+    from gspread.utils import numericise
+
+    converted = {}
+    column = []
+    for value in values:
+        result = converted.get(value)
+        if result is None:
+            first = value[:1] if type(value) is str else None
+            if first and first < "\x80" and first not in NUMERIC_START:
+                result = value
+            else:
+                result = numericise(value)
+            converted[value] = result
+        column.append(result)
+    return column
+
+
+class RecordView(Mapping):
+    """
+    A read-only view of one row of ColumnarRecords.
+
+    It behaves like the record dictionary of gspread, but it only keeps
+    the store and the position of the row, so it can be created when it is
+    needed and thrown away.
+    """
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store, index):
+        """
+        Initializes the RecordView class.
+
+        Args:
+            store (ColumnarRecords): The store of the records.
+            index (int): The position of the row in the store.
+        """
+        self._store = store
+        self._index = index
+
+    def __getitem__(self, header):
+        """
+        Returns the value of a column.
+
+        Args:
+            header (str): The header of the column.
+
+        Returns:
+            The value of the cell.
+        """
+        store = self._store
+        return store._columns[store._positions[header]][self._index]
+
+    def get(self, header, default=None):
+        """
+        Returns the value of a column or the default.
+
+        Args:
+            header (str): The header of the column.
+            default: The value returned if there is no such column.
+
+        Returns:
+            The value of the cell.
+        """
+        store = self._store
+        position = store._positions.get(header)
+        if position is None:
+            return default
+        return store._columns[position][self._index]
+
+    def __iter__(self):
+        """Iterates over the headers."""
+        return iter(self._store.headers)
+
+    def __len__(self):
+        """Returns the number of columns."""
+        return len(self._store.headers)
+
+    def __repr__(self):
+        """Returns the record as a dictionary."""
+        return repr(dict(self))
+
+
+class ColumnarRecords:
+    """
+    Compact storage of the records of a worksheet, one sequence per column.
+
+    Columns which hold only integers are stored in arrays of 64-bit
+    integers. Other columns are lists whose strings are interned, so
+    repeated values such as author IDs are stored once. Rows are read
+    through RecordView objects which are created on access.
+
+    Attributes:
+        headers (list): The headers of the columns.
+    """
+
+    def __init__(self, headers):
+        """
+        Initializes the ColumnarRecords class.
+
+        Args:
+            headers (list): The headers of the columns.
+        """
+        self.headers = list(headers)
+        self._positions = {header: i for i, header in enumerate(headers)}
+        self._columns = [array("q") for _ in self.headers]
+        self._length = 0
+
+    @staticmethod
+    def intern(value):
+        """
+        Interns a string so that equal strings share one object.
+
+        Args:
+            value: The value of a cell.
+
+        Returns:
+            The same value, strings are interned.
+        """
+        return sys.intern(value) if type(value) is str else value
+
+    @classmethod
+    def make_column(cls, values):
+        """
+        Creates the storage of a column.
+
+        Args:
+            values (list): The values of the column.
+
+        Returns:
+            array or list: An array if all values are integers, otherwise
+            a list of interned values.
+        """
+        if all(type(value) is int for value in values):
+            try:
+                return array("q", values)
+            except OverflowError:
+                pass
+        return [cls.intern(value) for value in values]
+
+    @classmethod
+    def from_rows(cls, headers, rows, convert=None):
+        """
+        Creates the store from rows of values.
+
+        Args:
+            headers (list): The headers of the columns.
+            rows (list): A list of rows in the order of the headers.
+            convert (callable or None): A function which converts
+            the values of a column, e.g. numericise_column.
+
+        Returns:
+            ColumnarRecords: The store.
+        """
+        store = cls(headers)
+        columns = []
+        for i in range(len(store.headers)):
+            values = [row[i] if i < len(row) else "" for row in rows]
+            if convert is not None:
+                values = convert(values)
+            columns.append(cls.make_column(values))
+        store._columns = columns
+        store._length = len(rows)
+        return store
+
+    @classmethod
+    def from_records(cls, headers, records):
+        """
+        Creates the store from record dictionaries.
+
+        Args:
+            headers (list): The headers of the columns.
+            records (list): A list of dictionaries keyed by the headers.
+
+        Returns:
+            ColumnarRecords: The store.
+        """
+        store = cls(headers)
+        store._columns = [
+            cls.make_column([record.get(header, "") for record in records])
+            for header in store.headers
+        ]
+        store._length = len(records)
+        return store
+
+    def __len__(self):
+        """Returns the number of rows."""
+        return self._length
+
+    def __getitem__(self, index):
+        """
+        Returns a view of a row.
+
+        Args:
+            index (int or slice): The position of the row.
+
+        Returns:
+            RecordView or list: The view or a list of views for a slice.
+        """
+        if isinstance(index, slice):
+            return [
+                RecordView(self, i) for i in range(*index.indices(len(self)))
+            ]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("record index out of range")
+        return RecordView(self, index)
+
+    def __iter__(self):
+        """Iterates over the views of the rows."""
+        for index in range(self._length):
+            yield RecordView(self, index)
+
+    def get_value(self, index, header):
+        """
+        Returns the value of a cell.
+
+        Args:
+            index (int): The position of the row.
+            header (str): The header of the column.
+
+        Returns:
+            The value of the cell.
+        """
+        return self._columns[self._positions[header]][index]
+
+    def column(self, header):
+        """
+        Returns the values of a column.
+
+        Args:
+            header (str): The header of the column.
+
+        Returns:
+            array or list or None: The values which must not be changed,
+            or None if there is no such column.
+        """
+        position = self._positions.get(header)
+        return None if position is None else self._columns[position]
+
+    def _set_value(self, position, index, value):
+        """
+        Stores a value and turns an integer column into a list if needed.
+
+        Args:
+            position (int): The position of the column.
+            index (int): The position of the row, equal to the length
+            to append.
+            value: The value of the cell.
+        """
+        column = self._columns[position]
+        if isinstance(column, array):
+            try:
+                if type(value) is not int:
+                    raise TypeError(value)
+                if index == len(column):
+                    column.append(value)
+                else:
+                    column[index] = value
+                return
+            except (TypeError, OverflowError):
+                column = self._columns[position] = list(column)
+        value = self.intern(value)
+        if index == len(column):
+            column.append(value)
+        else:
+            column[index] = value
+
+    def append(self, record):
+        """
+        Appends a row.
+
+        Args:
+            record (dict): The record keyed by the headers.
+        """
+        for position, header in enumerate(self.headers):
+            self._set_value(position, self._length, record.get(header, ""))
+        self._length += 1
+
+    def __setitem__(self, index, record):
+        """
+        Replaces a row.
+
+        Args:
+            index (int): The position of the row.
+            record (dict): The record keyed by the headers.
+        """
+        if index < 0:
+            index += self._length
+        for position, header in enumerate(self.headers):
+            self._set_value(position, index, record.get(header, ""))
+
+    def iter_rows(self):
+        """
+        Iterates over the rows as lists of values.
+
+        Yields:
+            list: The values of the row in the order of the headers.
+        """
+        return (list(row) for row in zip(*self._columns))
@@ -1,26 +1,164 @@
 import os
+import select
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from colorama import Fore
-from googlesheets_setup import GoogleSheetsClient
+from googlesheets_setup import GoogleSheetsClient, DeferredWorksheet
 from authors import Authors
 from books import Books
 from menu import Menu
 
 
-CREDS = GoogleSheetsClient.get_creds("creds.json")
+CREDS_FILE = "creds.json"
+SHEET_NAME = "library"
+# The storage backend is chosen by the environment: "sheets" or "sqlite"
+BACKEND = os.environ.get("LIBRARY_BACKEND", "sheets")
+SQLITE_PATH = os.environ.get("LIBRARY_SQLITE_PATH", "library.sqlite3")
+# The URL of a local stand-in of the Sheets API, see sheets_stub_server.py
+SHEETS_API_URL = os.environ.get("LIBRARY_SHEETS_API_URL")
+# The local snapshot of the worksheets, an empty value disables it
+SNAPSHOT_PATH = os.environ.get(
+    "LIBRARY_SNAPSHOT_PATH",
+    "library_snapshot.sqlite3"
+)
+# Workers of the web terminal pool load the data before a session starts
+POOLED_WORKER = os.environ.get("LIBRARY_POOLED_WORKER") == "1"
+# How often an idle worker reloads the records, shorter than the cache TTL
+POOL_REFRESH_INTERVAL = float(os.environ.get("LIBRARY_POOL_REFRESH", 240))
+# Invisible escape sequence which tells the pool that the worker is warm
+READY_MARKER = "\x1b]library-ready\x07"
 
 
-def main():
-    """Run all program functions"""
-    sheet_name = "library"
+def get_client(backend=BACKEND):
+    """
+    Creates the client of the configured storage backend.
+
+    Args:
+        backend (str): "sheets" for Google Sheets or "sqlite" for the local
+        SQLite database.
+
+    Returns:
+        GoogleSheetsClient or SQLiteClient: The client.
+    """
+    if backend == "sqlite":
+        from sqlite_storage import SQLiteClient
+
+        return SQLiteClient(SQLITE_PATH)
+    if SHEETS_API_URL:
+        return GoogleSheetsClient(None, SHEETS_API_URL)
+    return GoogleSheetsClient(GoogleSheetsClient.get_creds(CREDS_FILE))
+
+
+def open_managers(
+    sheet_name=SHEET_NAME, backend=BACKEND, wait=True, load_snapshots=True
+):
+    """
+    Creates the client and opens the authors and books worksheets.
+
+    The credentials are loaded and both worksheets are opened at the same
+    time in background threads. With Google Sheets, the records of the last
+    run are loaded from the local snapshot and revalidated in background.
+
+    Args:
+        sheet_name (str): The name of the Google Sheet.
+        backend (str): "sheets" or "sqlite".
+        wait (bool): If it is False, the managers are returned at once,
+        the worksheets are opened on first use and the snapshot is
+        revalidated in background. Otherwise the records are up to date.
+        load_snapshots (bool): If it is False, the snapshots are not loaded
+        and the records are downloaded on first use. Tools which stream
+        the worksheet do not need them.
+
+    Returns:
+        tuple: (Authors, Books) managers of the worksheets.
+    """
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="open")
+    client = executor.submit(get_client, backend)
+
+    def open_worksheet(worksheet):
+        return client.result().open_worksheet(sheet_name, worksheet)
+
+    # Open both worksheets at the same time once the client is ready
+    authors_sheet = DeferredWorksheet(
+        executor.submit(open_worksheet, "authors")
+    )
+    books_sheet = DeferredWorksheet(executor.submit(open_worksheet, "books"))
 
-    # Initialize the client and open the worksheet
-    client = GoogleSheetsClient(CREDS)
+    snapshot_store = None
+    if backend != "sqlite" and SNAPSHOT_PATH:
+        from snapshot_store import SnapshotStore
+
+        snapshot_store = SnapshotStore(SNAPSHOT_PATH)
 
     # Initialize the Authors manager
-    authors_manager = Authors(client.open_worksheet(sheet_name, "authors"))
+    authors_manager = Authors(authors_sheet, snapshot_store=snapshot_store)
 
     # Initialize the Books manager
-    books_manager = Books(client.open_worksheet(sheet_name, "books"))
+    books_manager = Books(books_sheet, snapshot_store=snapshot_store)
+
+    revalidations = []
+    for manager in (authors_manager, books_manager):
+        if load_snapshots and manager.load_snapshot():
+            # Use the snapshot now and check it once the worksheet is open
+            revalidations.append(executor.submit(manager.revalidate))
+    executor.shutdown(wait=False)
+
+    if wait:
+        # Raise the errors of the opening here
+        authors_sheet.resolve()
+        books_sheet.resolve()
+        for revalidation in revalidations:
+            revalidation.result()
+
+    return authors_manager, books_manager
+
+
+def wait_for_session(
+    authors_manager,
+    books_manager,
+    refresh_interval=POOL_REFRESH_INTERVAL
+):
+    """
+    Keeps the records warm until the web terminal attaches a session.
+
+    The pool of the web terminal writes a line to the terminal when
+    a session is attached to the worker.
+
+    Args:
+        authors_manager (Authors): An instance of the Authors class.
+        books_manager (Books): An instance of the Books class.
+        refresh_interval (float): Seconds between the reloads.
+    """
+    from async_googlesheets import load_records
+
+    ready = False
+    while True:
+        try:
+            # Sync both worksheets at the same time
+            authors_manager.expire()
+            books_manager.expire()
+            load_records(books_manager, authors_manager)
+        except Exception:
+            # The pool replaces a worker which cannot load the data, later
+            # errors are shown when the session uses the worksheet
+            if not ready:
+                raise
+        if not ready:
+            print(READY_MARKER, end="", flush=True)
+            ready = True
+        attached, _, _ = select.select([sys.stdin], [], [], refresh_interval)
+        if attached:
+            sys.stdin.readline()
+            return
+
+
+def main():
+    """Run all program functions"""
+    # The worksheets are opened while the menu is shown
+    authors_manager, books_manager = open_managers(wait=False)
+    if POOLED_WORKER:
+        # Wait with warm records until a session is attached
+        wait_for_session(authors_manager, books_manager)
 
     # Clear the terminal
     os.system('cls' if os.name == 'nt' else 'clear')
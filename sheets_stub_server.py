@@ -0,0 +1,603 @@
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+from googlesheets_setup import column_letter
+from sqlite_storage import SQLiteWorksheet
+
+
+class StubSpreadsheets:
+    """
+    The in-memory spreadsheets served by the stand-in server.
+
+    Attributes:
+        spreadsheets (dict): A dictionary where the key is the spreadsheet ID
+        and the value is a dictionary with "name", "createdTime",
+        "modifiedTime", "version" and "sheets". "sheets" maps the title of
+        a worksheet to its list of rows.
+        lock (threading.Lock): The lock which protects the data.
+    """
+
+    def __init__(self):
+        """Initializes the StubSpreadsheets class."""
+        self.spreadsheets = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def now():
+        """
+        Returns the current time in the format of the Drive API.
+
+        Returns:
+            str: The UTC time, e.g. "2024-06-01T10:00:00.000Z".
+        """
+        return (
+            datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+            .replace("+00:00", "Z")
+        )
+
+    def add_spreadsheet(self, name, sheets):
+        """
+        Adds a spreadsheet.
+
+        Args:
+            name (str): The name of the spreadsheet.
+            sheets (dict): A dictionary where the key is the title of
+            a worksheet and the value is the list of rows with the header row.
+
+        Returns:
+            str: The ID of the spreadsheet.
+        """
+        spreadsheet_id = uuid.uuid4().hex
+        self.spreadsheets[spreadsheet_id] = {
+            "name": name,
+            "createdTime": self.now(),
+            "modifiedTime": self.now(),
+            "version": 1,
+            "sheets": {
+                title: [list(row) for row in rows]
+                for title, rows in sheets.items()
+            },
+        }
+        return spreadsheet_id
+
+    def touch(self, spreadsheet):
+        """
+        Marks the spreadsheet as modified.
+
+        Args:
+            spreadsheet (dict): The spreadsheet.
+        """
+        spreadsheet["modifiedTime"] = self.now()
+        spreadsheet["version"] += 1
+
+    @staticmethod
+    def split_range(range_name):
+        """
+        Splits an absolute range like "'books'!A2:D" into its parts.
+
+        Args:
+            range_name (str): The range.
+
+        Returns:
+            tuple: (title of the worksheet, A1 range or None).
+        """
+        match = re.fullmatch(r"'((?:[^']|'')*)'(?:!(.*))?", range_name)
+        if match:
+            return match.group(1).replace("''", "'"), match.group(2)
+        title, _, a1_range = range_name.partition("!")
+        return title, a1_range or None
+
+    @staticmethod
+    def trim(rows):
+        """
+        Removes the trailing empty cells and rows like the Sheets API does.
+
+        Args:
+            rows (list): A list of rows.
+
+        Returns:
+            list: The trimmed rows.
+        """
+        trimmed = []
+        for row in rows:
+            row = list(row)
+            while row and row[-1] in ("", None):
+                row.pop()
+            trimmed.append(row)
+        while trimmed and not trimmed[-1]:
+            trimmed.pop()
+        return trimmed
+
+    def get_values(self, spreadsheet, range_name, major_dimension="ROWS"):
+        """
+        Reads the values of a range.
+
+        Args:
+            spreadsheet (dict): The spreadsheet.
+            range_name (str): The absolute range.
+            major_dimension (str): "ROWS" or "COLUMNS".
+
+        Returns:
+            dict: The ValueRange of the Sheets API.
+        """
+        title, a1_range = self.split_range(range_name)
+        rows = spreadsheet["sheets"][title]
+        first_row, first_column, last_row, last_column = 1, 1, None, None
+        if a1_range:
+            first_row, first_column, last_row, last_column = (
+                SQLiteWorksheet.parse_range(a1_range)
+            )
+            first_row = first_row or 1
+        selected = [
+            [
+                "" if value is None else str(value)
+                for value in row[first_column - 1:last_column]
+            ]
+            for row in rows[first_row - 1:last_row]
+        ]
+        values = self.trim(selected)
+        if major_dimension == "COLUMNS":
+            width = max((len(row) for row in values), default=0)
+            values = self.trim([
+                [row[i] if i < len(row) else "" for row in values]
+                for i in range(width)
+            ])
+        response = {"range": range_name, "majorDimension": major_dimension}
+        if values:
+            response["values"] = values
+        return response
+
+    def set_values(self, spreadsheet, range_name, values):
+        """
+        Writes the values of a range.
+
+        Args:
+            spreadsheet (dict): The spreadsheet.
+            range_name (str): The absolute range of the first cell.
+            values (list): A list of rows to write.
+
+        Returns:
+            dict: The UpdateValuesResponse of the Sheets API.
+        """
+        title, a1_range = self.split_range(range_name)
+        rows = spreadsheet["sheets"][title]
+        first_row, first_column, _, _ = SQLiteWorksheet.parse_range(a1_range)
+        for offset, row_values in enumerate(values):
+            while len(rows) < first_row + offset:
+                rows.append([])
+            row = rows[first_row + offset - 1]
+            for i, value in enumerate(row_values):
+                while len(row) < first_column + i:
+                    row.append("")
+                row[first_column + i - 1] = value
+        self.touch(spreadsheet)
+        return {
+            "updatedRange": range_name,
+            "updatedRows": len(values),
+            "updatedCells": sum(len(row) for row in values),
+        }
+
+    def append_values(self, spreadsheet, range_name, values):
+        """
+        Appends rows after the last row with data.
+
+        Args:
+            spreadsheet (dict): The spreadsheet.
+            range_name (str): The absolute range of the table.
+            values (list): A list of rows to append.
+
+        Returns:
+            dict: The AppendValuesResponse of the Sheets API.
+        """
+        title, _ = self.split_range(range_name)
+        rows = spreadsheet["sheets"][title]
+        del rows[len(self.trim(rows)):]
+        first_row = len(rows) + 1
+        rows.extend(list(row) for row in values)
+        self.touch(spreadsheet)
+        width = max((len(row) for row in values), default=1)
+        last_column = column_letter(width)
+        quoted_title = title.replace("'", "''")
+        return {
+            "tableRange": range_name,
+            "updates": {
+                "updatedRange": (
+                    f"'{quoted_title}'!A{first_row}:"
+                    f"{last_column}{first_row + len(values) - 1}"
+                ),
+                "updatedRows": len(values),
+            },
+        }
+
+    def get_metadata(self, spreadsheet_id):
+        """
+        Builds the spreadsheet metadata of the Sheets API.
+
+        Args:
+            spreadsheet_id (str): The ID of the spreadsheet.
+
+        Returns:
+            dict: The Spreadsheet resource without grid data.
+        """
+        spreadsheet = self.spreadsheets[spreadsheet_id]
+        return {
+            "spreadsheetId": spreadsheet_id,
+            "properties": {"title": spreadsheet["name"]},
+            "sheets": [
+                {
+                    "properties": {
+                        "sheetId": index,
+                        "title": title,
+                        "index": index,
+                        "sheetType": "GRID",
+                        "gridProperties": {
+                            "rowCount": max(1000, len(rows)),
+                            "columnCount": 26,
+                        },
+                    },
+                }
+                for index, (title, rows) in enumerate(
+                    spreadsheet["sheets"].items()
+                )
+            ],
+        }
+
+    def get_drive_file(self, spreadsheet_id):
+        """
+        Builds the Drive metadata of a spreadsheet.
+
+        Args:
+            spreadsheet_id (str): The ID of the spreadsheet.
+
+        Returns:
+            dict: The File resource of the Drive API.
+        """
+        spreadsheet = self.spreadsheets[spreadsheet_id]
+        return {
+            "kind": "drive#file",
+            "id": spreadsheet_id,
+            "name": spreadsheet["name"],
+            "mimeType": "application/vnd.google-apps.spreadsheet",
+            "createdTime": spreadsheet["createdTime"],
+            "modifiedTime": spreadsheet["modifiedTime"],
+            "version": str(spreadsheet["version"]),
+        }
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """
+    Handles the requests of the Sheets v4 and Drive v3 APIs used by gspread.
+
+    The server object provides "data" (StubSpreadsheets), "latency",
+    "error_rate" and "quota_per_minute".
+    """
+
+    def log_message(self, format, *args):
+        """Keeps the output of benchmarks clean."""
+
+    def send_json(self, status, body):
+        """
+        Sends a JSON response.
+
+        Args:
+            status (int): The HTTP status.
+            body (dict): The body of the response.
+        """
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def send_error_json(self, status, message):
+        """
+        Sends an error in the format of the Google APIs.
+
+        Args:
+            status (int): The HTTP status.
+            message (str): The error message.
+        """
+        self.send_json(
+            status,
+            {"error": {"code": status, "message": message, "status": message}}
+        )
+
+    def read_json(self):
+        """
+        Reads the JSON body of the request.
+
+        Returns:
+            dict: The body or an empty dictionary.
+        """
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length))
+
+    def is_over_quota(self):
+        """
+        Checks the injected quota and random 429 errors.
+
+        Returns:
+            bool: True if the request has to be rejected with 429.
+        """
+        server = self.server
+        if server.error_rate and random.random() < server.error_rate:
+            return True
+        if not server.quota_per_minute:
+            return False
+        now = time.monotonic()
+        with server.quota_lock:
+            requests = server.request_times
+            while requests and now - requests[0] >= 60:
+                requests.pop(0)
+            if len(requests) >= server.quota_per_minute:
+                return True
+            requests.append(now)
+        return False
+
+    def handle_request(self, method):
+        """
+        Routes the request.
+
+        Args:
+            method (str): The HTTP method.
+        """
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if self.is_over_quota():
+            self.send_error_json(429, "RESOURCE_EXHAUSTED")
+            return
+
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        data = self.server.data
+        try:
+            with data.lock:
+                status, body = self.route(method, url.path, query, data)
+        except KeyError as e:
+            status, body = 404, {
+                "error": {"code": 404, "message": f"Not found: {e}"}
+            }
+        self.send_json(status, body)
+
+    def route(self, method, path, query, data):
+        """
+        Runs the handler of the endpoint.
+
+        Args:
+            method (str): The HTTP method.
+            path (str): The path of the URL.
+            query (dict): The parsed query string.
+            data (StubSpreadsheets): The spreadsheets.
+
+        Returns:
+            tuple: (HTTP status, body of the response).
+        """
+        if path == "/drive/v3/files" and method == "GET":
+            match = re.search(r'name = "([^"]*)"', query.get("q", [""])[0])
+            files = [
+                data.get_drive_file(spreadsheet_id)
+                for spreadsheet_id, spreadsheet in data.spreadsheets.items()
+                if match is None or spreadsheet["name"] == match.group(1)
+            ]
+            return 200, {"kind": "drive#fileList", "files": files}
+
+        match = re.fullmatch(r"/drive/v3/files/([^/]+)", path)
+        if match and method == "GET":
+            return 200, data.get_drive_file(match.group(1))
+
+        match = re.fullmatch(r"/v4/spreadsheets/([^/:]+)(.*)", path)
+        if not match:
+            return 404, {"error": {"code": 404, "message": "Unknown path"}}
+        spreadsheet_id, rest = match.groups()
+        spreadsheet = data.spreadsheets[spreadsheet_id]
+        body = self.read_json() if method in ("POST", "PUT") else {}
+
+        if rest == "" and method == "GET":
+            return 200, data.get_metadata(spreadsheet_id)
+        if rest == ":batchUpdate" and method == "POST":
+            # Structural updates are not needed by the application
+            return 200, {
+                "spreadsheetId": spreadsheet_id,
+                "replies": [{} for _ in body.get("requests", [])],
+            }
+        if rest == "/values:batchGet" and method == "GET":
+            major_dimension = query.get("majorDimension", ["ROWS"])[0]
+            return 200, {
+                "spreadsheetId": spreadsheet_id,
+                "valueRanges": [
+                    data.get_values(spreadsheet, range_name, major_dimension)
+                    for range_name in query.get("ranges", [])
+                ],
+            }
+        if rest == "/values:batchUpdate" and method == "POST":
+            responses = [
+                data.set_values(spreadsheet, item["range"], item["values"])
+                for item in body.get("data", [])
+            ]
+            return 200, {
+                "spreadsheetId": spreadsheet_id,
+                "totalUpdatedRows": sum(
+                    response["updatedRows"] for response in responses
+                ),
+                "responses": responses,
+            }
+
+        match = re.fullmatch(r"/values/(.+?)(:append)?", rest)
+        if not match:
+            return 404, {"error": {"code": 404, "message": "Unknown path"}}
+        range_name = unquote(match.group(1))
+        if match.group(2) and method == "POST":
+            return 200, data.append_values(
+                spreadsheet,
+                range_name,
+                body.get("values", [])
+            )
+        if method == "PUT":
+            return 200, data.set_values(
+                spreadsheet,
+                range_name,
+                body.get("values", [])
+            )
+        if method == "GET":
+            major_dimension = query.get("majorDimension", ["ROWS"])[0]
+            return 200, data.get_values(
+                spreadsheet,
+                range_name,
+                major_dimension
+            )
+        return 404, {"error": {"code": 404, "message": "Unknown method"}}
+
+    def do_GET(self):
+        """Handles GET requests."""
+        self.handle_request("GET")
+
+    def do_POST(self):
+        """Handles POST requests."""
+        self.handle_request("POST")
+
+    def do_PUT(self):
+        """Handles PUT requests."""
+        self.handle_request("PUT")
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    A local HTTP stand-in for the Google Sheets and Drive APIs.
+
+    Attributes:
+        data (StubSpreadsheets): The spreadsheets.
+        latency (float): The delay in seconds added to every request.
+        error_rate (float): The probability of a random 429 response.
+        quota_per_minute (int or None): The number of requests allowed in
+        a minute before 429 responses are sent.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address,
+        data,
+        latency=0,
+        error_rate=0,
+        quota_per_minute=None
+    ):
+        """
+        Initializes the StubServer class.
+
+        Args:
+            address (tuple): (host, port). Port 0 picks a free port.
+            data (StubSpreadsheets): The spreadsheets.
+            latency (float): The delay in seconds added to every request.
+            error_rate (float): The probability of a random 429 response.
+            quota_per_minute (int or None): The number of requests allowed
+            in a minute.
+        """
+        super().__init__(address, StubRequestHandler)
+        self.data = data
+        self.latency = latency
+        self.error_rate = error_rate
+        self.quota_per_minute = quota_per_minute
+        self.quota_lock = threading.Lock()
+        self.request_times = []
+
+    @property
+    def url(self):
+        """
+        The base URL which GoogleSheetsClient is pointed at.
+
+        Returns:
+            str: The URL, e.g. "http://127.0.0.1:8765".
+        """
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """
+        Serves the requests in a background thread.
+
+        Returns:
+            threading.Thread: The thread of the server.
+        """
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+def create_library_data(seed_file=None):
+    """
+    Creates the "library" spreadsheet with the authors and books worksheets.
+
+    Args:
+        seed_file (str or None): Path to a JSON file where the key is
+        the title of a worksheet and the value is the list of rows with
+        the header row.
+
+    Returns:
+        StubSpreadsheets: The spreadsheets.
+    """
+    sheets = {
+        "authors": [["ID", "FULL NAME", "BIRTH YEAR"]],
+        "books": [["ID", "TITLE", "AUTHOR (ID)", "SHELF"]],
+    }
+    if seed_file:
+        with open(seed_file, encoding="utf-8") as file:
+            sheets.update(json.load(file))
+    data = StubSpreadsheets()
+    data.add_spreadsheet("library", sheets)
+    return data
+
+
+def main():
+    """Runs the stand-in server until it is interrupted."""
+    parser = argparse.ArgumentParser(
+        description="Local stand-in for the Google Sheets and Drive APIs."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", help="JSON file with worksheet rows.")
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0,
+        help="Delay in seconds added to every request.",
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0,
+        help="Probability of a random 429 response.",
+    )
+    parser.add_argument(
+        "--quota-per-minute",
+        type=int,
+        help="Requests allowed in a minute before 429 responses.",
+    )
+    args = parser.parse_args()
+
+    server = StubServer(
+        (args.host, args.port),
+        create_library_data(args.seed),
+        args.latency,
+        args.error_rate,
+        args.quota_per_minute
+    )
+    print(f"Serving the Sheets API stand-in on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
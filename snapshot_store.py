@@ -0,0 +1,105 @@
+import json
+import sqlite3
+import threading
+import time
+
+
+class SnapshotStore:
+    """
+    A local SQLite file with the last downloaded records of the worksheets.
+
+    Every snapshot keeps the headers, the rows and the revision of
+    the spreadsheet they were read at. The database uses write-ahead
+    logging, so several terminal processes on the same host can read it
+    while one of them saves a newer snapshot.
+
+    Attributes:
+        path (str): Path to the database file.
+        connection (sqlite3.Connection): The connection to the database.
+        lock (threading.Lock): The lock which serializes the queries.
+    """
+
+    def __init__(self, path):
+        """
+        Initializes the SnapshotStore class.
+
+        Args:
+            path (str): Path to the database file.
+        """
+        self.path = path
+        self.connection = sqlite3.connect(
+            path,
+            timeout=30,
+            check_same_thread=False
+        )
+        self.lock = threading.Lock()
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots "
+                "(name TEXT PRIMARY KEY, revision TEXT NOT NULL, "
+                "headers TEXT NOT NULL, rows TEXT NOT NULL, "
+                "saved_at REAL NOT NULL)"
+            )
+
+    def load(self, name):
+        """
+        Loads a snapshot.
+
+        Args:
+            name (str): The name of the snapshot, e.g. "authors".
+
+        Returns:
+            dict or None: "revision", "headers" and "rows" or None if
+            there is no snapshot.
+        """
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT revision, headers, rows FROM snapshots "
+                "WHERE name = ?",
+                (name,)
+            ).fetchone()
+        if not row:
+            return None
+        return {
+            "revision": tuple(json.loads(row[0])),
+            "headers": json.loads(row[1]),
+            "rows": json.loads(row[2]),
+        }
+
+    def save(self, name, revision, headers, rows):
+        """
+        Saves a snapshot and replaces the previous one.
+
+        Nothing is written if the stored snapshot already has the revision,
+        for example because another process saved it.
+
+        Args:
+            name (str): The name of the snapshot, e.g. "authors".
+            revision (tuple): The revision of the spreadsheet.
+            headers (list): The headers of the worksheet.
+            rows (iterable): The rows of values in the order of
+            the headers.
+        """
+        revision = json.dumps(list(revision))
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT revision FROM snapshots WHERE name = ?",
+                (name,)
+            ).fetchone()
+        if row and row[0] == revision:
+            return
+        rows = list(rows)
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO snapshots "
+                "(name, revision, headers, rows, saved_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    name,
+                    revision,
+                    json.dumps(headers),
+                    json.dumps(rows, ensure_ascii=False, default=str),
+                    time.time(),
+                )
+            )
@@ -0,0 +1,375 @@
+import json
+import re
+import sqlite3
+import threading
+from googlesheets_setup import column_letter
+
+
+class SQLiteClient:
+    """
+    A client class which stores the worksheets in a local SQLite database.
+
+    It has the same open_worksheet method as GoogleSheetsClient, so the
+    managers work with either of them.
+
+    Attributes:
+        path (str): Path to the database file.
+        connection (sqlite3.Connection): The connection to the database.
+        lock (threading.Lock): The lock which serializes the queries.
+    """
+
+    def __init__(self, path):
+        """
+        Initializes the SQLiteClient class.
+
+        Args:
+            path (str): Path to the database file. ":memory:" keeps the data
+            in memory.
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS worksheets "
+                "(name TEXT PRIMARY KEY, headers TEXT NOT NULL)"
+            )
+
+    def open_worksheet(self, sheet_name, worksheet):
+        """
+        Opens a worksheet stored in the database.
+
+        Args:
+            sheet_name (str): The name of the Google Sheet. The database file
+            holds one spreadsheet, so the name is not used.
+            worksheet (str): The name of the worksheet.
+
+        Returns:
+            SQLiteWorksheet: The worksheet object.
+        """
+        return SQLiteWorksheet(self, worksheet)
+
+
+class SQLiteWorksheet:
+    """
+    A worksheet stored in a SQLite table.
+
+    It implements the part of gspread.models.Worksheet which GoogleSheet
+    uses. The table has one column per header and the column row_number
+    which is the row of the worksheet, so row 2 is the first record.
+    Values keep their Python types.
+
+    Attributes:
+        client (SQLiteClient): The client which owns the connection.
+        title (str): The name of the worksheet and of the table.
+        headers (list): The headers of the columns in worksheet order.
+    """
+
+    def __init__(self, client, title):
+        """
+        Initializes the SQLiteWorksheet class.
+
+        Args:
+            client (SQLiteClient): The client which owns the connection.
+            title (str): The name of the worksheet.
+        """
+        self.client = client
+        self.title = title
+        self.headers = []
+        with self.client.lock:
+            row = self.client.connection.execute(
+                "SELECT headers FROM worksheets WHERE name = ?",
+                (title,)
+            ).fetchone()
+        if row:
+            self.headers = json.loads(row[0])
+
+    @staticmethod
+    def quote(name):
+        """
+        Quotes a table or column name.
+
+        Args:
+            name (str): The name.
+
+        Returns:
+            str: The quoted identifier.
+        """
+        return '"' + name.replace('"', '""') + '"'
+
+    def ensure_columns(self, headers):
+        """
+        Creates the table if it does not exist.
+
+        The headers of an existing table are kept, the same way the columns
+        of an existing worksheet keep their positions. The table has no
+        indexes on the columns, because GoogleSheet reads whole columns and
+        looks values up in its own indexes.
+
+        Args:
+            headers (list): The headers of the columns.
+        """
+        if not self.headers:
+            self.headers = list(headers)
+        table = self.quote(self.title)
+        columns = ", ".join(self.quote(header) for header in self.headers)
+        with self.client.lock, self.client.connection as connection:
+            connection.execute(
+                "INSERT OR IGNORE INTO worksheets (name, headers) "
+                "VALUES (?, ?)",
+                (self.title, json.dumps(self.headers))
+            )
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                f"(row_number INTEGER PRIMARY KEY, {columns})"
+            )
+
+    @staticmethod
+    def parse_range(range_name):
+        """
+        Parses an A1 range like "A2:D10", "B5", "A:A" or "A1:1".
+
+        Args:
+            range_name (str): The A1 range. The sheet name is ignored.
+
+        Returns:
+            tuple: (first row, first column, last row, last column). Rows are
+            None when the range has no row numbers. The first column is 1 and
+            the last column is None when the range has no column letters.
+        """
+        range_name = range_name.split("!")[-1]
+        cells = []
+        for cell in range_name.split(":"):
+            match = re.fullmatch(r"([A-Z]*)(\d*)", cell.upper())
+            column = 0
+            for letter in match.group(1):
+                column = column * 26 + ord(letter) - ord("A") + 1
+            row = int(match.group(2)) if match.group(2) else None
+            cells.append((row, column or None))
+        if len(cells) == 1:
+            cells.append(cells[0])
+        return cells[0][0], cells[0][1] or 1, cells[1][0], cells[1][1]
+
+    def _select(self, first_row=None, last_row=None):
+        """
+        Reads the rows of the table.
+
+        Args:
+            first_row (int or None): The first row number to read.
+            last_row (int or None): The last row number to read.
+
+        Returns:
+            list: A list of tuples (row_number, value, ...).
+        """
+        query = f"SELECT * FROM {self.quote(self.title)}"
+        conditions = []
+        parameters = []
+        if first_row is not None:
+            conditions.append("row_number >= ?")
+            parameters.append(first_row)
+        if last_row is not None:
+            conditions.append("row_number <= ?")
+            parameters.append(last_row)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY row_number"
+        with self.client.lock:
+            return self.client.connection.execute(
+                query,
+                parameters
+            ).fetchall()
+
+    def get_all_records(self):
+        """
+        Retrieves all records of the worksheet.
+
+        Returns:
+            list: A list of dictionaries where the key is the header.
+        """
+        return [
+            dict(zip(self.headers, row[1:]))
+            for row in self._select()
+        ]
+
+    def get_all_values(self):
+        """
+        Retrieves all values including the header row.
+
+        Returns:
+            list: A list of rows. Every row is a list of strings.
+        """
+        return [list(self.headers)] + [
+            ["" if value is None else str(value) for value in row[1:]]
+            for row in self._select()
+        ]
+
+    def row_values(self, row):
+        """
+        Retrieves the values of a row.
+
+        Args:
+            row (int): The row number.
+
+        Returns:
+            list: A list of values.
+        """
+        if row == 1:
+            return list(self.headers)
+        rows = self._select(row, row)
+        return list(rows[0][1:]) if rows else []
+
+    def get(self, range_name):
+        """
+        Retrieves the values of an A1 range.
+
+        Args:
+            range_name (str): The A1 range, e.g. "A2:D5001".
+
+        Returns:
+            list: A list of rows. Every row is a list of strings.
+        """
+        first_row, first_column, last_row, last_column = self.parse_range(
+            range_name
+        )
+        values = []
+        if first_row is None or first_row <= 1:
+            values.append(self.headers[first_column - 1:last_column])
+            first_row = 2
+        for row in self._select(first_row, last_row):
+            values.append([
+                "" if value is None else str(value)
+                for value in row[1:][first_column - 1:last_column]
+            ])
+        return values
+
+    def batch_get(self, ranges, major_dimension=None):
+        """
+        Retrieves the values of several A1 ranges.
+
+        Like the API, empty cells at the end of the rows and empty rows at
+        the end of a range are left out.
+
+        Args:
+            ranges (list): The A1 ranges, e.g. ["B2:B", "A5:D5"].
+            major_dimension (str or None): "COLUMNS" returns every range
+            as a list of columns, otherwise it is a list of rows.
+
+        Returns:
+            list: The values of every range.
+        """
+        value_ranges = []
+        for range_name in ranges:
+            values = self.get(range_name)
+            if major_dimension == "COLUMNS":
+                values = [list(column) for column in zip(*values)]
+            for row in values:
+                while row and row[-1] == "":
+                    row.pop()
+            while values and not values[-1]:
+                values.pop()
+            value_ranges.append(values)
+        return value_ranges
+
+    def _write_cells(self, connection, range_name, values):
+        """
+        Writes the values of an A1 range.
+
+        Args:
+            connection (sqlite3.Connection): The connection in a transaction.
+            range_name (str): The A1 range of the first cell.
+            values (list): A list of rows to write.
+        """
+        first_row, first_column, _, _ = self.parse_range(range_name)
+        table = self.quote(self.title)
+        for offset, row_values in enumerate(values):
+            row = first_row + offset
+            cells = [
+                (self.headers[first_column - 1 + i], value)
+                for i, value in enumerate(row_values)
+                if first_column - 1 + i < len(self.headers)
+            ]
+            if not cells:
+                continue
+            connection.execute(
+                f"INSERT OR IGNORE INTO {table} (row_number) VALUES (?)",
+                (row,)
+            )
+            assignments = ", ".join(
+                f"{self.quote(header)} = ?" for header, _ in cells
+            )
+            connection.execute(
+                f"UPDATE {table} SET {assignments} WHERE row_number = ?",
+                [value for _, value in cells] + [row]
+            )
+
+    def update(self, range_name, values):
+        """
+        Updates the cells of an A1 range.
+
+        Args:
+            range_name (str): The A1 range, e.g. "A5:Z5".
+            values (list): A list of rows to write.
+        """
+        with self.client.lock, self.client.connection as connection:
+            self._write_cells(connection, range_name, values)
+
+    def batch_update(self, data):
+        """
+        Updates several ranges in one transaction.
+
+        Args:
+            data (list): A list of dictionaries with "range" and "values".
+        """
+        with self.client.lock, self.client.connection as connection:
+            for item in data:
+                self._write_cells(connection, item["range"], item["values"])
+
+    def append_rows(self, values):
+        """
+        Appends rows after the last row of the worksheet.
+
+        Args:
+            values (list): A list of rows to append.
+
+        Returns:
+            dict: The response in the format of the Sheets API with
+            the updated range.
+        """
+        table = self.quote(self.title)
+        columns = ", ".join(self.quote(header) for header in self.headers)
+        placeholders = ", ".join("?" for _ in range(len(self.headers) + 1))
+        with self.client.lock, self.client.connection as connection:
+            last_row = connection.execute(
+                f"SELECT MAX(row_number) FROM {table}"
+            ).fetchone()[0] or 1
+            connection.executemany(
+                f"INSERT INTO {table} (row_number, {columns}) "
+                f"VALUES ({placeholders})",
+                [
+                    [last_row + 1 + offset] + (
+                        list(row_values) + [""] * len(self.headers)
+                    )[:len(self.headers)]
+                    for offset, row_values in enumerate(values)
+                ]
+            )
+        last_column = column_letter(len(self.headers))
+        return {
+            "updates": {
+                "updatedRange": (
+                    f"{self.title}!A{last_row + 1}:"
+                    f"{last_column}{last_row + len(values)}"
+                ),
+            },
+        }
+
+    def append_row(self, values):
+        """
+        Appends a row after the last row of the worksheet.
+
+        Args:
+            values (list): The values of the row.
+
+        Returns:
+            dict: The response in the format of the Sheets API.
+        """
+        return self.append_rows([values])
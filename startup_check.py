@@ -0,0 +1,123 @@
+import argparse
+import os
+import subprocess
+import sys
+from colorama import Fore
+
+
+# Modules which are only needed after the first menu is shown
+DEFERRED_MODULES = [
+    "gspread",
+    "google.auth",
+    "requests",
+    "asyncio",
+    "sqlite3",
+    "simple_term_menu",
+]
+
+
+def measure_imports(module):
+    """
+    Imports a module in a new interpreter with "-X importtime".
+
+    Args:
+        module (str): The name of the module, e.g. "run".
+
+    Returns:
+        list: A list of tuples (depth, cumulative microseconds, module name)
+        in the order printed by Python.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if not fields[1].strip().isdigit():
+            # Skip the header line
+            continue
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((depth, int(fields[1]), name.strip()))
+    return imports
+
+
+def check_startup(module, budget_ms, deferred_modules):
+    """
+    Checks the import time of a module and the modules it imports.
+
+    Args:
+        module (str): The name of the module, e.g. "run".
+        budget_ms (float): The maximal import time in milliseconds.
+        deferred_modules (list): Modules which must not be imported.
+
+    Returns:
+        bool: True if the module is within the budget.
+    """
+    imports = measure_imports(module)
+    end = next(
+        i for i, (depth, _, name) in enumerate(imports)
+        if depth == 0 and name == module
+    )
+    # The modules imported by the module are printed before it
+    start = end
+    while start > 0 and imports[start - 1][0] > 0:
+        start -= 1
+    subtree = imports[start:end + 1]
+    total_ms = imports[end][1] / 1000
+    names = {name for _, _, name in subtree}
+    passed = True
+
+    # Print the slowest imports to find the cause of a regression
+    print(f"Slowest imports of {module}:")
+    slowest = sorted(subtree, key=lambda item: item[1], reverse=True)
+    for depth, cumulative, name in slowest[:10]:
+        print(f"{cumulative / 1000:>10.1f} ms  {'  ' * depth}{name}")
+
+    for name in deferred_modules:
+        if name in names:
+            print(Fore.RED + f"{name} is imported at start-up.")
+            passed = False
+
+    if total_ms > budget_ms:
+        print(
+            Fore.RED +
+            f"Importing {module} took {total_ms:.1f} ms, "
+            f"the budget is {budget_ms:.1f} ms."
+        )
+        passed = False
+    else:
+        print(
+            Fore.GREEN +
+            f"Importing {module} took {total_ms:.1f} ms "
+            f"of {budget_ms:.1f} ms."
+        )
+    return passed
+
+
+def main():
+    """Fails if the start-up of the application is over the budget."""
+    parser = argparse.ArgumentParser(
+        description="Check the import time of the application."
+    )
+    parser.add_argument("--module", default="run")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=150,
+        help="The maximal import time in milliseconds.",
+    )
+    args = parser.parse_args()
+
+    if not check_startup(args.module, args.budget_ms, DEFERRED_MODULES):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+import shutil
+import sys
+from colorama import Fore
+
+
+class TablePager:
+    """
+    Shows a table page by page.
+
+    The table is given as columns, so the rows of a page are taken from
+    them only when the page is shown. The widths of the columns are
+    computed once from the whole table, so every page is aligned the same
+    way and showing a page costs the same for any number of rows.
+
+    When the input or the output is not a terminal, all pages are printed
+    at once without any prompt.
+
+    Attributes:
+        headers (list): The headers of the columns.
+        columns (list): The sequences of values, one for every header.
+        row_count (int): The number of rows of the table.
+        page_size (int): The number of rows on one page.
+        widths (list): The widths of the columns in characters.
+    """
+
+    # The lines printed around the rows of a page
+    FRAME_LINES = 7
+    # Columns are not shrunk below this width to fit the terminal
+    MIN_COLUMN_WIDTH = 10
+
+    def __init__(self, headers, columns, page_size=None):
+        """
+        Initializes the TablePager class.
+
+        Args:
+            headers (list): The headers of the columns.
+            columns (list): The sequences of values, one for every header.
+            They are read, never changed.
+            page_size (int or None): The number of rows on one page.
+            None fits a page to the height of the terminal.
+        """
+        terminal = shutil.get_terminal_size()
+        self.headers = headers
+        self.columns = columns
+        self.row_count = len(columns[0]) if columns else 0
+        if page_size is None:
+            page_size = terminal.lines - self.FRAME_LINES
+        self.page_size = max(1, page_size)
+        # Output which is not shown in a terminal keeps whole values
+        self.widths = self.get_widths(
+            headers,
+            columns,
+            terminal.columns if sys.stdout.isatty() else None
+        )
+
+    @classmethod
+    def from_rows(cls, table, page_size=None):
+        """
+        Creates the pager from a list of rows.
+
+        Args:
+            table (list): A list of rows, the first row is the header.
+            page_size (int or None): The number of rows on one page.
+
+        Returns:
+            TablePager: The pager.
+        """
+        headers = table[0]
+        columns = [list(column) for column in zip(*table[1:])]
+        return cls(headers, columns or [[] for _ in headers], page_size)
+
+    @classmethod
+    def get_widths(cls, headers, columns, terminal_width):
+        """
+        Computes the widths of the columns.
+
+        Args:
+            headers (list): The headers of the columns.
+            columns (list): The sequences of values.
+            terminal_width (int or None): The width of the terminal.
+            None keeps the widths of the values.
+
+        Returns:
+            list: The width of every column. The widest columns except
+            the first one, which holds the IDs, are shrunk to fit
+            the terminal.
+        """
+        widths = [
+            max([len(str(header))] + [len(str(value)) for value in column])
+            for header, column in zip(headers, columns)
+        ]
+        if terminal_width is None:
+            return widths
+        # Two spaces separate the columns
+        excess = sum(widths) + 2 * (len(widths) - 1) - (terminal_width - 1)
+        while excess > 0 and len(widths) > 1:
+            widest = max(range(1, len(widths)), key=widths.__getitem__)
+            if widths[widest] <= cls.MIN_COLUMN_WIDTH:
+                break
+            widths[widest] -= 1
+            excess -= 1
+        return widths
+
+    @property
+    def page_count(self):
+        """Returns the number of pages, at least one."""
+        return max(1, -(-self.row_count // self.page_size))
+
+    def format_row(self, values):
+        """
+        Formats the values of a row.
+
+        Numbers are aligned to the right like tabulate does and values
+        longer than their column are cut.
+
+        Args:
+            values (iterable): The values of the row.
+
+        Returns:
+            str: The line of the row.
+        """
+        cells = []
+        for value, width in zip(values, self.widths):
+            text = str(value)
+            if len(text) > width:
+                text = text[:width - 1] + "~"
+            if isinstance(value, (int, float)):
+                cells.append(text.rjust(width))
+            else:
+                cells.append(text.ljust(width))
+        return "  ".join(cells).rstrip()
+
+    def format_rows(self, start, stop):
+        """
+        Formats the rows of the table between two positions.
+
+        Args:
+            start (int): The position of the first row.
+            stop (int): The position after the last row.
+
+        Returns:
+            str: The lines of the header and the rows.
+        """
+        separator = "  ".join("-" * width for width in self.widths)
+        lines = [separator, self.format_row(self.headers), separator]
+        for index in range(start, stop):
+            lines.append(
+                self.format_row(column[index] for column in self.columns)
+            )
+        lines.append(separator)
+        return "\n".join(lines)
+
+    def format_page(self, page):
+        """
+        Formats one page of the table.
+
+        Args:
+            page (int): The number of the page, starting from 0.
+
+        Returns:
+            str: The lines of the page.
+        """
+        start = page * self.page_size
+        return self.format_rows(
+            start,
+            min(start + self.page_size, self.row_count)
+        )
+
+    def show(self):
+        """Prints the table and lets the user move between the pages."""
+        if not (sys.stdin.isatty() and sys.stdout.isatty()):
+            # Nobody can answer the prompt, print the whole table
+            print(Fore.YELLOW + self.format_rows(0, self.row_count))
+            return
+
+        page = 0
+        while True:
+            print(Fore.YELLOW + self.format_page(page))
+            if self.page_count == 1:
+                return
+            first = page * self.page_size + 1
+            last = min(first + self.page_size - 1, self.row_count)
+            print(
+                f"Page {page + 1} of {self.page_count}, "
+                f"rows {first}-{last} of {self.row_count}"
+            )
+            choice = input(
+                "Enter for the next page, 'p' for the previous page, "
+                "a page number or 'q' to quit:\n"
+            ).strip().lower()
+            if choice == "q":
+                return
+            elif choice == "p":
+                page = max(page - 1, 0)
+            elif choice.isdigit():
+                if 1 <= int(choice) <= self.page_count:
+                    page = int(choice) - 1
+                else:
+                    print(
+                        Fore.RED +
+                        f"Enter a page from 1 to {self.page_count}."
+                    )
+            elif choice in ("", "n"):
+                if page + 1 == self.page_count:
+                    return
+                page += 1
+            else:
+                print(Fore.RED + "Invalid choice. Please try again.")